@@ -10,9 +10,9 @@
 # add these directories to sys.path here. If the directory is relative to the
 # documentation root, use os.path.abspath to make it absolute, like shown here.
 #
-# import os
-# import sys
-# sys.path.insert(0, os.path.abspath('.'))
+import os
+import sys
+sys.path.insert(0, os.path.abspath('.'))
 
 
 # -- Project information -----------------------------------------------------
@@ -32,6 +32,8 @@ release = '2019alpha'
 # ones.
 extensions = ['sphinx.ext.doctest',
               'sphinx.ext.mathjax',
+              'eidprog.sphinxprofile',
+              'eidprog.listings',
 ]
 
 # Add any paths that contain templates here, relative to this directory.
@@ -0,0 +1,6 @@
+"""Wiederverwendbare Module zu den Beispielen des Manuskripts.
+
+Die Figurenskripte unter ``images`` importieren dieses Paket. Beim direkten
+Aufruf eines Skripts muss daher das Verzeichnis ``manuskript`` im Suchpfad
+liegen, etwa mit ``PYTHONPATH=../.. python randomwalk.py``.
+"""
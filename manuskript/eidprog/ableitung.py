@@ -0,0 +1,82 @@
+"""Numerical derivatives of vectorized functions.
+
+The function ``ableitung`` of the chapter on functions evaluates a central
+difference quotient at a single point with a fixed step size.  The
+functions in this module accept arrays of points and call the function once
+per point of the difference stencil with the whole array, so that the
+derivatives at many points cost about as much as at a single point.
+
+The step size is chosen for every point relative to its magnitude so that
+truncation and rounding errors are balanced.  By default, two central
+difference quotients with step sizes ``h`` and ``h/2`` are combined by
+Richardson extrapolation, which removes the error of order ``h**2``.
+"""
+
+import numpy as np
+
+_EPS = np.finfo(float).eps
+
+
+def schrittweite(x, richardson=True):
+    """Return step sizes suited for central differences at the points x.
+
+    The step sizes are adjusted so that ``x+h`` and ``x-h`` are exactly
+    representable distances from ``x``.
+    """
+    x = np.asarray(x, dtype=float)
+    exponent = 1/5 if richardson else 1/3
+    h = _EPS**exponent*np.maximum(np.abs(x), 1)
+    return (x+h)-x
+
+
+def _zentral(f, x, h):
+    return (f(x+h)-f(x-h))/(2*h)
+
+
+def ableitung(f, x, h=None, richardson=True):
+    """Return the derivative of ``f`` at the points ``x``.
+
+    ``f`` has to accept arrays and is applied elementwise.
+    """
+    x = np.asarray(x, dtype=float)
+    if h is None:
+        h = schrittweite(x, richardson)
+    d = _zentral(f, x, h)
+    if richardson:
+        d = (4*_zentral(f, x, h/2)-d)/3
+    return d
+
+
+def jacobi(f, x, h=None, richardson=True):
+    """Return the Jacobian matrices of ``f`` at the points ``x``.
+
+    ``x`` has shape ``(..., n)`` and ``f`` maps it to an array of shape
+    ``(..., m)``.  The result has shape ``(..., m, n)``.
+    """
+    x = np.asarray(x, dtype=float)
+    if h is None:
+        h = schrittweite(x, richardson)
+    h = np.broadcast_to(h, x.shape)
+    spalten = []
+    for i in range(x.shape[-1]):
+        e = np.zeros(x.shape)
+        e[..., i] = h[..., i]
+
+        def partiell(t, e=e):
+            return (f(x+t*e)-f(x-t*e))/(2*t*e[..., i:i+1])
+
+        d = partiell(1)
+        if richardson:
+            d = (4*partiell(0.5)-d)/3
+        spalten.append(d)
+    return np.stack(spalten, axis=-1)
+
+
+def gradient(f, x, h=None, richardson=True):
+    """Return the gradients of a scalar function ``f`` at the points ``x``.
+
+    ``x`` has shape ``(..., n)`` and ``f`` maps it to shape ``(...)``.
+    """
+    def g(y):
+        return np.asarray(f(y))[..., np.newaxis]
+    return jacobi(g, x, h, richardson)[..., 0, :]
@@ -0,0 +1,317 @@
+"""Benchmarks of the algorithms of the manuscript.
+
+Every benchmark times a function for several input sizes.  The reference
+versions from ``eidprog.referenz`` and the optimized versions from the
+other modules of the package are timed for the same inputs, so that the
+speedup can be read off directly.  The fastest of several repetitions is
+taken as result.
+
+The results are stored in ``_build/benchmarks.json`` under the current
+commit, with ``+`` appended if the working tree has local changes; results
+of repeated runs for the same commit replace the earlier ones.
+Results which are slower than those of the last other commit in the history
+by more than the threshold are reported as regressions, and the program
+exits with status 1.  For every group of benchmarks a plot of the run time
+as function of the input size is written to ``_build/benchmarks``.
+
+Usage, from the directory ``manuskript``::
+
+    python -m eidprog.benchmark [--quick] [--threshold 0.2] [NAME ...]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+MANUSKRIPT = Path(__file__).resolve().parent.parent
+HISTORY = MANUSKRIPT / "_build" / "benchmarks.json"
+PLOTS = MANUSKRIPT / "_build" / "benchmarks"
+
+#: registered benchmarks: name -> (setup function, sizes)
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes):
+    """Register a benchmark.
+
+    The decorated function is called with an input size and returns a
+    function without arguments which performs the work to be timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+    return register
+
+
+@benchmark("is_prime/referenz", [1000, 3000, 10000])
+def _(n):
+    from .referenz import is_prime
+    return lambda: sum(is_prime(k) for k in range(2, n))
+
+
+@benchmark("is_prime/primzahlen", [1000, 3000, 10000, 100000])
+def _(n):
+    from .primzahlen import PrimeTable
+    return lambda: len(PrimeTable(limit=n).primes_between(2, n))
+
+
+@benchmark("fakultaet/referenz", [100, 1000, 10000])
+def _(n):
+    from .referenz import fakultaet
+    return lambda: fakultaet(n)
+
+
+@benchmark("fakultaet/rekursiv", [100, 300, 900])
+def _(n):
+    from .referenz import fakultaet_rekursiv
+    return lambda: fakultaet_rekursiv(n)
+
+
+@benchmark("fakultaet/fakultaet", [100, 1000, 10000, 100000])
+def _(n):
+    from . import fakultaet
+
+    def run():
+        fakultaet.cache_clear()
+        return fakultaet.fakultaet(n)
+    return run
+
+
+def _fractions(n):
+    rng = np.random.default_rng(1)
+    return rng.integers(1, 100, size=(4, n)).tolist()
+
+
+@benchmark("bruch/referenz", [100, 1000, 10000])
+def _(n):
+    from .referenz import Bruch
+    a, b, c, d = _fractions(n)
+    x = [Bruch(*z) for z in zip(a, b)]
+    y = [Bruch(*z) for z in zip(c, d)]
+    return lambda: [u+v for u, v in zip(x, y)]
+
+
+@benchmark("bruch/bruch", [100, 1000, 10000, 100000])
+def _(n):
+    from .bruch import Bruch
+    a, b, c, d = _fractions(n)
+    x = [Bruch(*z) for z in zip(a, b)]
+    y = [Bruch(*z) for z in zip(c, d)]
+    return lambda: [u+v for u, v in zip(x, y)]
+
+
+@benchmark("bruch/BruchArray", [100, 1000, 10000, 100000])
+def _(n):
+    from .bruch import BruchArray
+    a, b, c, d = _fractions(n)
+    x = BruchArray(a, b)
+    y = BruchArray(c, d)
+    return lambda: x+y
+
+
+@benchmark("ableitung/referenz", [1000, 10000, 100000])
+def _(n):
+    from math import sin
+    from .referenz import ableitung
+    x = np.linspace(0, 10, n).tolist()
+    return lambda: [ableitung(sin, xi) for xi in x]
+
+
+@benchmark("ableitung/ableitung", [1000, 10000, 100000, 1000000])
+def _(n):
+    from .ableitung import ableitung
+    x = np.linspace(0, 10, n)
+    return lambda: ableitung(np.sin, x)
+
+
+@benchmark("randomwalk/referenz", [1000, 10000, 100000])
+def _(n):
+    from .referenz import randomwalk
+    return lambda: randomwalk(n)
+
+
+@benchmark("randomwalk/randomwalk", [1000, 10000, 100000, 1000000])
+def _(n):
+    from .randomwalk import trajectories
+    return lambda: trajectories(1, n, seed=1)
+
+
+@benchmark("hex_string/referenz", [2**10, 2**13, 2**16])
+def _(n):
+    from .referenz import get_hex_string
+    return lambda: [get_hex_string(cp) for cp in range(n)]
+
+
+@benchmark("hex_string/unicodetables", [2**10, 2**13, 2**16, 2**20])
+def _(n):
+    from .unicodetables import utf8
+    cp = np.arange(n)
+    return lambda: utf8(cp)
+
+
+@benchmark("odeint/referenz", [10, 100, 1000])
+def _(n):
+    from .referenz import oszillator
+    gamma = np.linspace(0, 1.9, n)
+    pts = np.linspace(0, 10, 101)
+    return lambda: [oszillator(g, pts) for g in gamma]
+
+
+@benchmark("odeint/oszillator", [10, 100, 1000, 10000])
+def _(n):
+    from .oszillator import solve
+    gamma = np.linspace(0, 1.9, n)
+    pts = np.linspace(0, 10, 101)
+    return lambda: [solve(gamma[k:k+256], 0, 1, pts)
+                    for k in range(0, n, 256)]
+
+
+@benchmark("quad/referenz", [10, 100, 1000])
+def _(n):
+    from .referenz import bessel
+    z = np.linspace(0, 20, n).tolist()
+    return lambda: [bessel(zi) for zi in z]
+
+
+@benchmark("quad/quadratur", [10, 100, 1000, 10000])
+def _(n):
+    from .quadratur import gauss_legendre
+    z = np.linspace(0, 20, n)
+    return lambda: gauss_legendre(lambda x, z: np.cos(z*np.cos(x)),
+                                  0, np.pi, (z,), n=64)
+
+
+def measure(func, repeat=3, mintime=0.05):
+    """Return the shortest time of a call of func in seconds.
+
+    The number of calls per repetition is increased by factors of ten until
+    a repetition takes at least ``mintime`` seconds.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < mintime:
+        number = 10*number
+    return min(timer.repeat(repeat, number))/number
+
+
+def commit():
+    """Return the current commit, marked with + for local changes."""
+    def git(*args):
+        return subprocess.run(("git",)+args, cwd=MANUSKRIPT,
+                              capture_output=True, text=True).stdout.strip()
+    head = git("rev-parse", "--short", "HEAD") or "unknown"
+    return head+"+" if git("status", "--porcelain", "--", ".") else head
+
+
+def load_history():
+    try:
+        with open(HISTORY) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_history(history):
+    HISTORY.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY, "w") as f:
+        json.dump(history, f, indent=1)
+
+
+def run(names=None, quick=False):
+    """Run the benchmarks and return the results.
+
+    The results map every benchmark name to a dictionary of times indexed
+    by the input size as string.  In quick mode only the two smallest
+    sizes are used.
+    """
+    results = {}
+    for name, (setup, sizes) in BENCHMARKS.items():
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        results[name] = {}
+        for size in sizes[:2] if quick else sizes:
+            elapsed = measure(setup(size))
+            results[name][str(size)] = elapsed
+            print("{:30s} {:>8} {:12.6f} s".format(name, size, elapsed))
+    return results
+
+
+def regressions(results, previous, threshold):
+    """Return the entries of results slower than previous by threshold."""
+    slower = []
+    for name, times in results.items():
+        for size, elapsed in times.items():
+            before = previous.get(name, {}).get(size)
+            if before and elapsed > (1+threshold)*before:
+                slower.append((name, size, before, elapsed))
+    return slower
+
+
+def plot(history):
+    """Plot the run times of the last entry against the input size."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    entry = history[-1]
+    groups = {}
+    for name, times in entry["results"].items():
+        groups.setdefault(name.split("/")[0], []).append((name, times))
+    PLOTS.mkdir(parents=True, exist_ok=True)
+    for group, members in groups.items():
+        fig, ax = plt.subplots()
+        for name, times in members:
+            sizes = sorted(times, key=int)
+            ax.loglog([int(s) for s in sizes], [times[s] for s in sizes],
+                      "o-", label=name.split("/", 1)[1])
+        ax.set_xlabel("Größe")
+        ax.set_ylabel("Zeit (s)")
+        ax.set_title("{} ({})".format(group, entry["commit"]))
+        ax.legend()
+        fig.savefig(PLOTS / "{}.png".format(group))
+        plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*",
+                        help="run only benchmarks starting with NAME")
+    parser.add_argument("--quick", "-q", action="store_true",
+                        help="only use the two smallest input sizes")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as regression")
+    parser.add_argument("--no-plots", dest="plots", action="store_false")
+    args = parser.parse_args(argv)
+    results = run(args.names, args.quick)
+    history = load_history()
+    current = commit()
+    previous = {}
+    for entry in reversed(history):
+        if entry["commit"] != current:
+            previous = entry["results"]
+            break
+    if history and history[-1]["commit"] == current:
+        entry = history.pop()
+        entry["results"].update(results)
+        results = entry["results"]
+    history = [e for e in history if e["commit"] != current]
+    history.append({"commit": current, "time": time.time(),
+                    "results": results})
+    save_history(history)
+    if args.plots:
+        plot(history)
+    slower = regressions(results, previous, args.threshold)
+    for name, size, before, elapsed in slower:
+        print("regression: {} for {}: {:.6f} s -> {:.6f} s".format(
+              name, size, before, elapsed))
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Diagrams of the bits of an integer divided into fields.
+
+The figures on the binary representation of integers and on the UTF-8
+encoding show a row of cells with one binary digit each, below or above
+which the hexadecimal digits are marked by brackets.  A ``BitLayout``
+describes such a row by a sequence of fields, each given by its number of
+bits and its shading.  The geometry is computed once when the layout is
+created; drawing a value places the prepared paths by translations and
+adds the digits as labels, whose typeset boxes are cached by
+``eidprog.latex``.  Therefore many values can be drawn in one process at
+little cost, either into one canvas by repeated calls of ``draw`` or into
+one file per value by ``batch``::
+
+    python -m eidprog.bitfeld [--bits 32] [--group 8] PATTERN VALUE ...
+
+writes ``PATTERN.format(value)`` for every value, for example
+``--bits 16 bits_{:04X}.pdf 0xE9``.
+"""
+
+import argparse
+
+from pyx import canvas, color, deco, path, text, trafo
+
+from . import latex
+
+
+class BitLayout:
+    """Layout of a row of bits divided into fields.
+
+    ``fields`` is a sequence of pairs ``(nbits, shade)``.  Fields with
+    ``shade`` None are outlined, the others are filled with the grey level
+    ``shade``.  After every ``group`` bits a gap of width ``gap`` is
+    inserted.  ``nibbles`` is ``"above"``, ``"below"`` or None and
+    determines where the hexadecimal digits are shown.
+    """
+
+    def __init__(self, fields, size=0.4, group=None, gap=0.1,
+                 nibbles="above", dy=0.07):
+        self.fields = [(nbits, shade) for nbits, shade in fields]
+        self.nbits = sum(nbits for nbits, _ in self.fields)
+        self.size = size
+        self.group = group
+        self.gap = gap
+        self.nibbles = nibbles
+        self.dy = dy
+        self.width = self.x(self.nbits-1)+size
+        self._fills = []
+        self._strokes = []
+        start = 0
+        for nbits, shade in self.fields:
+            rect = path.rect(self.x(start), 0, self.x(start+nbits-1)+size
+                             - self.x(start), size)
+            if shade is None:
+                self._strokes.append(rect)
+            else:
+                grey = color.grey(shade)
+                self._fills.append((rect, [grey, deco.stroked([grey])]))
+            start = start+nbits
+        if nibbles == "above":
+            y, ylabel = size, size+0.14
+            self._nibbleattrs = [text.halign.center]
+        else:
+            y, ylabel = 0, -0.14
+            self._nibbleattrs = [text.halign.center, text.valign.top]
+        sign = 1 if nibbles == "above" else -1
+        self._bracket = path.path(path.moveto(0.2*size, y+sign*0.03),
+                                  path.lineto(0.2*size, y+sign*0.07),
+                                  path.lineto(3.8*size, y+sign*0.07),
+                                  path.lineto(3.8*size, y+sign*0.03))
+        self._ylabel = ylabel
+
+    def x(self, n):
+        """Return the left edge of bit n, counted from the left."""
+        gaps = n//self.group if self.group else 0
+        return n*self.size+gaps*self.gap
+
+    def bits(self, value):
+        """Return the binary digits of value, most significant first."""
+        return [(value >> (self.nbits-1-n)) & 1 for n in range(self.nbits)]
+
+    def draw(self, c, value, x0=0, y0=0):
+        """Draw the bits of value into the canvas c at (x0, y0)."""
+        move = [trafo.translate(x0, y0)]
+        for rect, attrs in self._fills:
+            c.fill(rect, attrs+move)
+        for rect in self._strokes:
+            c.stroke(rect, move)
+        for n, bit in enumerate(self.bits(value)):
+            latex.label(c, x0+self.x(n)+0.5*self.size, y0+self.dy,
+                        r"\sffamily %i" % bit, [text.halign.center])
+        if self.nibbles is None:
+            return
+        nnibbles = self.nbits//4
+        for n in range(nnibbles):
+            x = x0+self.x(4*n)
+            c.stroke(self._bracket, [trafo.translate(x, y0)])
+            nibble = (value >> 4*(nnibbles-1-n)) & 0xf
+            latex.label(c, x+2*self.size, y0+self._ylabel,
+                        r"\sffamily %X" % nibble, self._nibbleattrs)
+
+    def diagram(self, value):
+        """Return a new canvas showing value."""
+        c = canvas.canvas()
+        self.draw(c, value)
+        return c
+
+
+def batch(layout, values, pattern):
+    """Write one PDF file per value, named by formatting pattern."""
+    for value in values:
+        layout.diagram(value).writePDFfile(pattern.format(value))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern", help="format string for the file names")
+    parser.add_argument("values", nargs="+", type=lambda s: int(s, 0))
+    parser.add_argument("--bits", type=int, default=32)
+    parser.add_argument("--group", type=int,
+                        help="insert a gap after every GROUP bits")
+    args = parser.parse_args(argv)
+    latex.engine()
+    layout = BitLayout([(1, None)]*args.bits, group=args.group)
+    batch(layout, args.values, args.pattern)
+
+
+if __name__ == "__main__":
+    main()
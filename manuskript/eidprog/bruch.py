@@ -0,0 +1,348 @@
+"""Fractions following the ``Bruch`` class of the chapter on object
+oriented programming.
+
+``Bruch`` keeps the interface of the class developed in the manuscript but
+stores numerator and denominator in slots, reduces with the Euclidean
+algorithm based on division remainders, ``math.gcd``, and can be hashed
+consistently with integers and floats.  ``BruchArray`` holds many fractions
+as two NumPy integer arrays and performs arithmetic and comparisons for all
+elements at once.  If intermediate results no longer fit into 64 bit
+integers, the arrays are converted to arrays of Python integers.
+"""
+
+import math
+import numbers
+import sys
+
+import numpy as np
+
+_MODULUS = sys.hash_info.modulus
+_LIMIT = 2.0**62
+
+
+class Bruch:
+
+    __slots__ = ("zaehler", "nenner")
+
+    def __init__(self, zaehler, nenner=1):
+        if nenner == 0:
+            raise ZeroDivisionError("Bruch(%s, 0)" % zaehler)
+        if nenner < 0:
+            zaehler, nenner = -zaehler, -nenner
+        g = math.gcd(zaehler, nenner)
+        self.zaehler = zaehler//g
+        self.nenner = nenner//g
+
+    @classmethod
+    def _reduced(cls, zaehler, nenner):
+        b = object.__new__(cls)
+        b.zaehler = zaehler
+        b.nenner = nenner
+        return b
+
+    @staticmethod
+    def _cast(other):
+        if isinstance(other, Bruch):
+            return other
+        if isinstance(other, numbers.Integral):
+            return Bruch._reduced(int(other), 1)
+        return NotImplemented
+
+    def __str__(self):
+        if self.nenner != 1:
+            return "{}/{}".format(self.zaehler, self.nenner)
+        else:
+            return str(self.zaehler)
+
+    def __repr__(self):
+        return "Bruch({}, {})".format(self.zaehler, self.nenner)
+
+    def prettyprint(self):
+        """Gibt den Bruch dreizeilig aus, wobei Zähler und Nenner
+        zentriert gesetzt sind.
+
+        """
+        zaehler_str = str(self.zaehler)
+        nenner_str = str(self.nenner)
+        feldbreite = max(len(zaehler_str), len(nenner_str))
+        bruchstrich = "-"*feldbreite
+        print("{}\n{}\n{}".format(zaehler_str.center(feldbreite),
+                                  bruchstrich,
+                                  nenner_str.center(feldbreite)))
+
+    def __add__(self, other):
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return Bruch(self.zaehler*other.nenner+self.nenner*other.zaehler,
+                     self.nenner*other.nenner)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return Bruch(self.zaehler*other.nenner-self.nenner*other.zaehler,
+                     self.nenner*other.nenner)
+
+    def __rsub__(self, other):
+        return -self+other
+
+    def __neg__(self):
+        return Bruch._reduced(-self.zaehler, self.nenner)
+
+    def __mul__(self, other):
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return Bruch(self.zaehler*other.zaehler, self.nenner*other.nenner)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return Bruch(self.zaehler*other.nenner, self.nenner*other.zaehler)
+
+    def __rtruediv__(self, other):
+        return Bruch(self.nenner, self.zaehler)*other
+
+    def __float__(self):
+        return self.zaehler/self.nenner
+
+    def _compare(self, other):
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return self.zaehler*other.nenner-other.zaehler*self.nenner
+
+    def __lt__(self, other):
+        d = self._compare(other)
+        return d if d is NotImplemented else d < 0
+
+    def __le__(self, other):
+        d = self._compare(other)
+        return d if d is NotImplemented else d <= 0
+
+    def __gt__(self, other):
+        d = self._compare(other)
+        return d if d is NotImplemented else d > 0
+
+    def __ge__(self, other):
+        d = self._compare(other)
+        return d if d is NotImplemented else d >= 0
+
+    def __eq__(self, other):
+        if isinstance(other, float):
+            return float(self) == other
+        other = self._cast(other)
+        if other is NotImplemented:
+            return other
+        return self.zaehler == other.zaehler and self.nenner == other.nenner
+
+    def __hash__(self):
+        # same algorithm as for fractions.Fraction, so that
+        # hash(Bruch(n, 1)) == hash(n) and hash(Bruch(1, 2)) == hash(0.5)
+        try:
+            inverse = pow(self.nenner, -1, _MODULUS)
+        except ValueError:
+            h = sys.hash_info.inf
+        else:
+            h = hash(abs(self.zaehler))*inverse % _MODULUS
+        h = h if self.zaehler >= 0 else -h
+        return -2 if h == -1 else h
+
+
+def _overflows(*products):
+    """Check whether any product of pairs of arrays may exceed int64."""
+    for a, b in products:
+        if a.dtype == object:
+            return True
+        if np.any(np.abs(a.astype(float))*np.abs(b.astype(float)) >= _LIMIT):
+            return True
+    return False
+
+
+def _widen(*arrays):
+    return [a.astype(object) for a in arrays]
+
+
+class BruchArray:
+    """Array of fractions with elementwise arithmetic.
+
+    Numerators and denominators are kept in the attributes ``zaehler`` and
+    ``nenner``, either as ``int64`` arrays or, after an overflow, as arrays
+    of Python integers.
+    """
+
+    __slots__ = ("zaehler", "nenner")
+    # let NumPy scalars and arrays defer to the reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, zaehler, nenner=1):
+        z = np.asarray(zaehler)
+        n = np.broadcast_to(np.asarray(nenner), z.shape)
+        if z.dtype != object and n.dtype != object:
+            z = z.astype(np.int64)
+            n = n.astype(np.int64)
+        else:
+            z, n = _widen(z, n)
+        if np.any(n == 0):
+            raise ZeroDivisionError("denominator zero in BruchArray")
+        sign = np.where(n < 0, -1, 1)
+        g = np.gcd(z, n)
+        self.zaehler = sign*z//g
+        self.nenner = sign*n//g
+
+    @classmethod
+    def _reduced(cls, zaehler, nenner):
+        a = object.__new__(cls)
+        a.zaehler = zaehler
+        a.nenner = nenner
+        return a
+
+    @classmethod
+    def from_bruch(cls, brueche):
+        """Create an array from an iterable of ``Bruch`` objects."""
+        brueche = list(brueche)
+        z = [b.zaehler for b in brueche]
+        n = [b.nenner for b in brueche]
+        try:
+            return cls._reduced(np.array(z, dtype=np.int64),
+                                np.array(n, dtype=np.int64))
+        except OverflowError:
+            return cls._reduced(np.array(z, dtype=object),
+                                np.array(n, dtype=object))
+
+    def _cast(self, other):
+        if isinstance(other, BruchArray):
+            return other.zaehler, other.nenner
+        if isinstance(other, Bruch):
+            return np.asarray(other.zaehler), np.asarray(other.nenner)
+        if isinstance(other, numbers.Integral):
+            return np.asarray(int(other)), np.asarray(1)
+        return None
+
+    def __len__(self):
+        return len(self.zaehler)
+
+    def __getitem__(self, index):
+        z = self.zaehler[index]
+        n = self.nenner[index]
+        if np.ndim(z) == 0:
+            return Bruch._reduced(int(z), int(n))
+        return BruchArray._reduced(z, n)
+
+    def __iter__(self):
+        for z, n in zip(self.zaehler.tolist(), self.nenner.tolist()):
+            yield Bruch._reduced(z, n)
+
+    def __repr__(self):
+        return "BruchArray({!r}, {!r})".format(self.zaehler.tolist(),
+                                               self.nenner.tolist())
+
+    def _linear(self, other, sign):
+        cast = self._cast(other)
+        if cast is None:
+            return NotImplemented
+        a, b = self.zaehler, self.nenner
+        c, d = cast
+        if _overflows((a, d), (c, b), (b, d)):
+            a, b, c, d = _widen(a, b, c, d)
+        return BruchArray(a*d+sign*c*b, b*d)
+
+    def __add__(self, other):
+        return self._linear(other, 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._linear(other, -1)
+
+    def __rsub__(self, other):
+        return -self+other
+
+    def __neg__(self):
+        return BruchArray._reduced(-self.zaehler, self.nenner)
+
+    def __mul__(self, other):
+        cast = self._cast(other)
+        if cast is None:
+            return NotImplemented
+        a, b = self.zaehler, self.nenner
+        c, d = cast
+        if _overflows((a, c), (b, d)):
+            a, b, c, d = _widen(a, b, c, d)
+        return BruchArray(a*c, b*d)
+
+    __rmul__ = __mul__
+
+    def _difference(self, other):
+        cast = self._cast(other)
+        if cast is None:
+            return None
+        a, b = self.zaehler, self.nenner
+        c, d = cast
+        if _overflows((a, d), (c, b)):
+            a, b, c, d = _widen(a, b, c, d)
+        return a*d-c*b
+
+    def __lt__(self, other):
+        d = self._difference(other)
+        return NotImplemented if d is None else np.asarray(d < 0, dtype=bool)
+
+    def __le__(self, other):
+        d = self._difference(other)
+        return NotImplemented if d is None else np.asarray(d <= 0, dtype=bool)
+
+    def __gt__(self, other):
+        d = self._difference(other)
+        return NotImplemented if d is None else np.asarray(d > 0, dtype=bool)
+
+    def __ge__(self, other):
+        d = self._difference(other)
+        return NotImplemented if d is None else np.asarray(d >= 0, dtype=bool)
+
+    def __eq__(self, other):
+        cast = self._cast(other)
+        if cast is None:
+            return NotImplemented
+        c, d = cast
+        return np.asarray((self.zaehler == c) & (self.nenner == d),
+                          dtype=bool)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else ~eq
+
+    __hash__ = None
+
+    def tofloat(self):
+        """Return the values as array of floats."""
+        if self.zaehler.dtype == object:
+            return np.array([z/n for z, n in zip(self.zaehler.tolist(),
+                                                  self.nenner.tolist())],
+                            dtype=float)
+        return self.zaehler/self.nenner
+
+    def sum(self):
+        """Return the sum of all elements as ``Bruch``.
+
+        The elements are added pairwise in vectorized steps.
+        """
+        a = self
+        if len(a) == 0:
+            return Bruch(0)
+        while len(a) > 1:
+            half = len(a)//2
+            s = a[:half]+a[half:2*half]
+            if len(a) % 2:
+                s = BruchArray._reduced(
+                    np.concatenate((s.zaehler, a.zaehler[-1:].astype(
+                        s.zaehler.dtype))),
+                    np.concatenate((s.nenner, a.nenner[-1:].astype(
+                        s.nenner.dtype))))
+            a = s
+        return a[0]
@@ -0,0 +1,109 @@
+"""Fast loading of columnar data files for the PyX figure scripts.
+
+``graph.data.file`` parses a data file line by line in Python, which is slow
+for large measurement files.  ``load`` parses the file with the C parser of
+NumPy and stores the result as binary sidecar ``<file>.cache.npy`` which is
+memory-mapped on later calls.  The sidecar is used as long as size and
+modification time of the data file are unchanged.  With ``verify=True`` the
+SHA-256 hash of the file is compared as well.
+
+``data`` returns the columns as PyX data source, optionally reduced to about
+``maxpoints`` points, so that it can replace ``graph.data.file``::
+
+    g.plot(datafile.data("pyx1.dat", x=1, y=2, maxpoints=2000))
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+
+import numpy as np
+from pyx import graph
+
+from . import decimate
+
+
+def _sidecars(filename):
+    # next to the actual file, also if it is linked into a staging directory
+    filename = os.path.realpath(filename)
+    return filename+".cache.npy", filename+".cache.json"
+
+
+def _fingerprint(filename, verify):
+    st = os.stat(filename)
+    fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if verify:
+        h = hashlib.sha256()
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                h.update(block)
+        fp["sha256"] = h.hexdigest()
+    return fp
+
+
+def _cached(filename, verify):
+    npyname, jsonname = _sidecars(filename)
+    try:
+        with open(jsonname) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+    current = _fingerprint(filename, verify and "sha256" in stored)
+    if any(stored.get(k) != v for k, v in current.items()):
+        return None
+    try:
+        return np.load(npyname, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def _replace(filename, write):
+    """Write a file under a temporary name and rename it to filename."""
+    tmpname = "{}.{}.tmp".format(filename, os.getpid())
+    try:
+        with open(tmpname, "wb") as f:
+            write(f)
+        os.replace(tmpname, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmpname)
+        raise
+
+
+def load(filename, comments="#", cache=True, verify=False):
+    """Return the data of a whitespace separated file as 2d array.
+
+    Rows correspond to lines of the file, columns to its columns.
+    """
+    if cache:
+        data = _cached(filename, verify)
+        if data is not None:
+            return data
+        fingerprint = _fingerprint(filename, True)
+    data = np.loadtxt(filename, comments=comments, ndmin=2)
+    if cache:
+        # several figure scripts may load the same file at the same time;
+        # the sidecars are replaced atomically, the fingerprint last
+        npyname, jsonname = _sidecars(filename)
+        _replace(npyname, lambda f: np.save(f, data))
+        _replace(jsonname,
+                 lambda f: f.write(json.dumps(fingerprint).encode()))
+        data = np.load(npyname, mmap_mode="r")
+    return data
+
+
+def data(filename, x=1, y=2, maxpoints=None, title=None, **kwargs):
+    """Return columns ``x`` and ``y`` of a file as PyX data source.
+
+    As for ``graph.data.file``, columns are counted starting at 1.
+    """
+    d = load(filename, **kwargs)
+    xs = d[:, x-1]
+    ys = d[:, y-1]
+    if maxpoints is not None and len(xs) > maxpoints:
+        # minmax keeps up to four points per bin
+        method = None if np.all(np.diff(xs) >= 0) else "lttb"
+        xs, ys = decimate.reduce(xs, ys, maxpoints/4, maxpoints/4, method)
+    return graph.data.values(x=xs.tolist(), y=ys.tolist(),
+                             title=filename if title is None else title)
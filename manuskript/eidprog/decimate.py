@@ -0,0 +1,176 @@
+"""Reduce long polylines to about the resolution of the output device.
+
+Plotting millions of points costs time and blows up the size of the
+resulting files although most of the points end up on the same pixel.  The
+functions in this module select a subset of the points which produces the
+same image at a given resolution:
+
+``minmax``
+    For curves with monotonic x values.  In every pixel column the first,
+    the last, the smallest and the largest value are kept (M4 algorithm).
+
+``lttb``
+    Largest triangle three buckets, keeps a fixed number of points which
+    preserve the visual shape of the curve.
+
+``pixelruns``
+    For arbitrary parametric curves like random walks.  Consecutive points
+    falling into the same pixel cell are replaced by the first and the last
+    of them.
+
+``plot`` chooses a method, determines the pixel size from the size and
+the range of the axes and passes the reduced data to matplotlib.
+"""
+
+import matplotlib
+import numpy as np
+
+
+def minmax(x, y, nbins, xmin=None, xmax=None):
+    """Return sorted indices of first, last, minimum and maximum per column.
+
+    The range from ``xmin`` to ``xmax``, by default the range of the sorted
+    values ``x``, is divided into ``nbins`` pixel columns.  The points left
+    and right of the range form one column each.
+    """
+    npts = len(y)
+    if npts <= 4*nbins:
+        return np.arange(npts)
+    xmin = x[0] if xmin is None else xmin
+    xmax = x[-1] if xmax is None else xmax
+    scale = nbins/((xmax-xmin) or 1)
+    column = np.clip(np.floor((x-xmin)*scale), -1, nbins).astype(np.int64)
+    starts = np.flatnonzero(np.diff(column, prepend=column[0]-1))
+    sizes = np.diff(np.append(starts, npts))
+    group = np.repeat(np.arange(len(starts)), sizes)
+    indices = [starts, starts+sizes-1]
+    for extremum in (np.minimum, np.maximum):
+        values = extremum.reduceat(y, starts)
+        candidates = np.flatnonzero(y == values[group])
+        _, first = np.unique(group[candidates], return_index=True)
+        indices.append(candidates[first])
+    return np.unique(np.concatenate(indices))
+
+
+def lttb(x, y, n):
+    """Return indices of ``n`` points selected by the LTTB algorithm."""
+    npts = len(x)
+    if n >= npts or n < 3:
+        return np.arange(npts)
+    edges = np.linspace(1, npts-1, n-1).astype(np.intp)
+    indices = np.empty(n, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = npts-1
+    a = 0
+    for i in range(n-2):
+        lo, hi = edges[i], edges[i+1]
+        if i+2 < len(edges):
+            nlo, nhi = edges[i+1], edges[i+2]
+        else:
+            nlo, nhi = npts-1, npts
+        cx = x[nlo:nhi].mean()
+        cy = y[nlo:nhi].mean()
+        area = np.abs((x[a]-cx)*(y[lo:hi]-y[a])-(x[a]-x[lo:hi])*(cy-y[a]))
+        a = lo+np.argmax(area)
+        indices[i+1] = a
+    return indices
+
+
+def pixelruns(x, y, xpixel, ypixel):
+    """Return indices of points where the curve enters or leaves a cell.
+
+    The plane is divided into cells of size ``xpixel`` times ``ypixel``.
+    All segments between the kept points lie within one cell.
+    """
+    npts = len(x)
+    if npts < 3:
+        return np.arange(npts)
+    ix = np.floor((x-x.min())/xpixel).astype(np.int64)
+    iy = np.floor((y-y.min())/ypixel).astype(np.int64)
+    cell = ix*(iy.max()+1)+iy
+    change = cell[1:] != cell[:-1]
+    keep = np.empty(npts, dtype=bool)
+    keep[0] = keep[-1] = True
+    keep[1:-1] = change[:-1] | change[1:]
+    return np.flatnonzero(keep)
+
+
+def pixelsize(ax, dpi=None):
+    """Return the size of the axes in pixels at the given resolution."""
+    fig = ax.figure
+    if dpi is None:
+        dpi = fig.dpi
+    bbox = ax.get_position()
+    width, height = fig.get_size_inches()
+    return bbox.width*width*dpi, bbox.height*height*dpi
+
+
+def plotrange(ax, x, y):
+    """Return the x and y ranges of the axes after plotting a curve.
+
+    For autoscaled axes these are the data limits extended by the curve,
+    otherwise the current view limits.
+    """
+    ranges = []
+    for values, interval, auto, limits in (
+            (x, ax.dataLim.intervalx, ax.get_autoscalex_on(), ax.get_xlim()),
+            (y, ax.dataLim.intervaly, ax.get_autoscaley_on(), ax.get_ylim())):
+        if auto:
+            lo, hi = np.nanmin(values), np.nanmax(values)
+            if ax.has_data():
+                lo, hi = min(lo, interval[0]), max(hi, interval[1])
+            ranges.append((lo, hi))
+        else:
+            ranges.append(tuple(sorted(limits)))
+    return ranges
+
+
+def reduce(x, y, width, height, method=None, tolerance=1, xlim=None,
+           ylim=None):
+    """Return the reduced data for an area of ``width`` x ``height`` pixels.
+
+    ``xlim`` and ``ylim`` are the ranges shown in this area, by default the
+    ranges of the data.  Without an explicit ``method``, ``minmax`` is used
+    for monotonically increasing x values and ``pixelruns`` otherwise.  For
+    ``pixelruns``, ``tolerance`` is the size of a cell in pixels.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if xlim is None:
+        xlim = (np.min(x), np.max(x)) if len(x) else (0, 1)
+    if ylim is None:
+        ylim = (np.min(y), np.max(y)) if len(y) else (0, 1)
+    if method is None:
+        method = "minmax" if np.all(np.diff(x) >= 0) else "pixelruns"
+    nbins = max(1, int(np.ceil(width)))
+    if method == "minmax":
+        indices = minmax(x, y, nbins, *xlim)
+    elif method == "lttb":
+        indices = lttb(x, y, 4*nbins)
+    elif method == "pixelruns":
+        xpixel = tolerance*((xlim[1]-xlim[0]) or 1)/width
+        ypixel = tolerance*((ylim[1]-ylim[0]) or 1)/height
+        indices = pixelruns(x, y, xpixel, ypixel)
+    else:
+        raise ValueError("unknown method {!r}".format(method))
+    return x[indices], y[indices]
+
+
+def plot(ax, x, y, *args, method=None, dpi=None, rasterized=False,
+         **kwargs):
+    """Plot the curve after reducing it to the resolution of the axes.
+
+    ``dpi`` should be the resolution of the final output, by default the
+    resolution of the figure is used.  Structures smaller than the line width
+    are not resolved.  With ``rasterized=True`` the curve is embedded as
+    bitmap in vector formats like PDF.
+    """
+    if dpi is None:
+        dpi = ax.figure.dpi
+    width, height = pixelsize(ax, dpi)
+    linewidth = kwargs.get("linewidth", kwargs.get("lw",
+                           matplotlib.rcParams["lines.linewidth"]))
+    tolerance = max(1, linewidth*dpi/72)
+    xlim, ylim = plotrange(ax, x, y)
+    xr, yr = reduce(x, y, width, height, method, tolerance, xlim, ylim)
+    return ax.plot(xr, yr, *args, rasterized=rasterized, **kwargs)
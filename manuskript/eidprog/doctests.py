@@ -0,0 +1,143 @@
+"""Parallel doctests for all chapters of the manuscript.
+
+The ``>>>`` examples of every file ``manuskript/*.rst`` are run as in
+``python -m doctest``, each file in a fresh worker process so that the
+examples of different chapters cannot influence each other.  The wall time
+of every example is measured and examples taking longer than a threshold
+are reported.  In incremental mode only files are run which changed since
+their last successful run or which failed last time.
+
+Usage, from the directory ``manuskript``::
+
+    python -m eidprog.doctests [--incremental] [--slow SECONDS] [FILE ...]
+"""
+
+import argparse
+import concurrent.futures
+import doctest
+import hashlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+MANUSKRIPT = Path(__file__).resolve().parent.parent
+STATE = MANUSKRIPT / "_build" / "doctests.json"
+
+
+class TimingRunner(doctest.DocTestRunner):
+    """DocTestRunner recording the wall time of every example."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = []
+        self._start = None
+
+    def report_start(self, out, test, example):
+        self._start = time.perf_counter()
+        super().report_start(out, test, example)
+
+    def _stop(self, example):
+        elapsed = time.perf_counter()-self._start
+        self.timings.append((example.lineno+1, example.source.rstrip(),
+                             elapsed))
+
+    def report_success(self, out, test, example, got):
+        self._stop(example)
+        super().report_success(out, test, example, got)
+
+    def report_failure(self, out, test, example, got):
+        self._stop(example)
+        super().report_failure(out, test, example, got)
+
+    def report_unexpected_exception(self, out, test, example, exc_info):
+        self._stop(example)
+        super().report_unexpected_exception(out, test, example, exc_info)
+
+
+def run_file(filename):
+    """Run the examples of one file and return a dictionary of results."""
+    path = Path(filename)
+    text = path.read_text(encoding="utf-8")
+    parser = doctest.DocTestParser()
+    test = parser.get_doctest(text, {"__name__": "__main__"}, path.name,
+                              str(path), 0)
+    runner = TimingRunner()
+    output = io.StringIO()
+    start = time.perf_counter()
+    runner.run(test, out=output.write)
+    result = runner.summarize(verbose=False)
+    return {"file": str(path),
+            "attempted": result.attempted,
+            "failed": result.failed,
+            "time": time.perf_counter()-start,
+            "timings": runner.timings,
+            "output": output.getvalue()}
+
+
+def digest(filename):
+    return hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+
+
+def load_state():
+    try:
+        return json.loads(STATE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE.parent.mkdir(parents=True, exist_ok=True)
+    STATE.write_text(json.dumps(state, indent=1, sort_keys=True)+"\n")
+
+
+def run(files, jobs=None, incremental=False, slow=1.0):
+    """Run the doctests of the files and return the number of failures."""
+    files = [str(Path(f).resolve()) for f in files]
+    state = load_state()
+    digests = {f: digest(f) for f in files}
+    if incremental:
+        files = [f for f in files if state.get(f) != digests[f]]
+    failures = 0
+    with concurrent.futures.ProcessPoolExecutor(
+            jobs, max_tasks_per_child=1) as ex:
+        results = ex.map(run_file, files)
+        for result in sorted(results, key=lambda r: r["file"]):
+            name = Path(result["file"]).name
+            sys.stdout.write(result["output"])
+            print("{}: {} examples, {} failed, {:.2f} s".format(
+                  name, result["attempted"], result["failed"],
+                  result["time"]))
+            for lineno, source, elapsed in result["timings"]:
+                if elapsed > slow:
+                    print("  slow: line {}, {:.2f} s: {}".format(
+                          lineno, elapsed, source.splitlines()[0]))
+            if result["failed"]:
+                failures = failures+result["failed"]
+                state.pop(result["file"], None)
+            else:
+                state[result["file"]] = digests[result["file"]]
+    save_state(state)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*",
+                        help="files to test, by default all chapters")
+    parser.add_argument("--incremental", "-i", action="store_true",
+                        help="only test files changed since their last "
+                             "successful run")
+    parser.add_argument("--slow", type=float, default=1.0,
+                        help="report examples taking longer than SLOW "
+                             "seconds")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of worker processes")
+    args = parser.parse_args(argv)
+    files = args.files or sorted(MANUSKRIPT.glob("*.rst"))
+    return 1 if run(files, args.jobs, args.incremental, args.slow) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+"""Incremental build of the figures under ``images``.
+
+Every Python script below ``images`` is a figure script, unless all its
+outputs are ignored by git.  Its outputs and inputs are determined from
+the source without running it: calls of ``writePDFfile``, ``writeGSfile``,
+``savefig`` and ``open(..., "w")`` name the outputs, other string
+constants naming files next to the script are inputs, and the modules of
+this package imported directly or indirectly are inputs as well.  A script is rerun only if the hash over its source and
+inputs differs from the one recorded at the last successful run in
+``_build/figures.json`` or if one of its outputs is missing.  Without a
+recorded hash the existing outputs are taken to be up to date.
+
+Every script runs in a staging directory below ``_build/figures``, in
+which the other files of its directory are linked, and its outputs are
+moved into place only if it succeeds.  A failing script, for example on a
+machine without LaTeX, thus leaves the previous outputs intact.  Stale
+scripts are run in parallel.  Scripts using the shared LaTeX engine
+of ``eidprog.latex`` are run together in one process, so that LaTeX is
+started only once and repeated labels are typeset only once.  Afterwards
+the PDF files are converted to PNG by ``eidprog.raster``; a PDF file
+written by a script without an entry in ``images/figures.toml`` is
+reported as failure.
+
+Most of the time of a small figure script is spent starting the
+interpreter and importing PyX, NumPy and Matplotlib.  Therefore the
+scripts are executed in processes forked from a server process which has
+imported the modules in ``PRELOAD`` once.  Every script, or the batch of
+LaTeX scripts, gets a freshly forked process, so that global settings like
+``unit.set(xscale=1.3)`` made by one script do not leak into the others.
+For every script the time from forking the process until the script
+starts executing and the time of its execution are reported.  With
+``--no-preload`` every script is run by a new interpreter instead.
+
+Usage, from the directory ``manuskript``::
+
+    python -m eidprog.figures [--force] [--jobs N] [--dry-run] [--no-preload]
+"""
+
+import argparse
+import ast
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from . import raster
+
+PACKAGE = Path(__file__).resolve().parent
+MANUSKRIPT = PACKAGE.parent
+IMAGES = MANUSKRIPT / "images"
+STAMPS = MANUSKRIPT / "_build" / "figures.json"
+STAGING = MANUSKRIPT / "_build" / "figures"
+PRELOAD = ["numpy", "matplotlib.pyplot", "pyx", "pyx.graph",
+           PACKAGE.name+".latex", PACKAGE.name+".decimate",
+           PACKAGE.name+".randomwalk"]
+
+
+@dataclass
+class Figure:
+    script: Path
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+
+    @property
+    def name(self):
+        return self.script.relative_to(IMAGES).as_posix()
+
+    def digest(self):
+        h = hashlib.sha256()
+        for p in [self.script]+self.inputs:
+            h.update(p.name.encode())
+            h.update(p.read_bytes())
+        return h.hexdigest()
+
+
+def _strings(call):
+    return [a.value for a in call.args
+            if isinstance(a, ast.Constant) and isinstance(a.value, str)]
+
+
+def _with_suffix(name, suffix):
+    return name if Path(name).suffix else name+suffix
+
+
+def _imports(tree):
+    """Return the names of the modules of this package imported in tree.
+
+    Absolute imports as in the figure scripts and relative imports as
+    within the package are recognized.
+    """
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = node.module.split(".") if node.module else []
+            elif node.module and node.module.split(".")[0] == PACKAGE.name:
+                parts = node.module.split(".")[1:]
+            else:
+                continue
+            if parts:
+                modules.add(parts[0])
+            else:
+                modules.update(a.name for a in node.names)
+        elif isinstance(node, ast.Import):
+            for a in node.names:
+                if a.name.startswith(PACKAGE.name+"."):
+                    modules.add(a.name.split(".")[1])
+    return modules
+
+
+@functools.lru_cache(maxsize=None)
+def _module_imports(path, mtime_ns):
+    return _imports(ast.parse(path.read_bytes(), str(path)))
+
+
+def _closure(tree):
+    """Return the modules of this package imported directly or indirectly."""
+    todo = list(_imports(tree))
+    modules = set()
+    while todo:
+        name = todo.pop()
+        path = PACKAGE / (name+".py")
+        if name in modules or not path.is_file():
+            continue
+        modules.add(name)
+        todo.extend(_module_imports(path, path.stat().st_mtime_ns))
+    return modules
+
+
+def analyse(script):
+    """Return a ``Figure`` describing inputs and outputs of ``script``."""
+    tree = ast.parse(script.read_bytes(), str(script))
+    directory = script.parent
+    stem = script.stem
+    outputs = set()
+    strings = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            strings.add(node.value)
+        elif isinstance(node, ast.Call):
+            args = _strings(node)
+            func = node.func
+            if isinstance(func, ast.Attribute):
+                if func.attr == "writePDFfile":
+                    outputs.add(_with_suffix(args[0], ".pdf") if args
+                                else stem+".pdf")
+                elif func.attr == "writeGSfile":
+                    outputs.add(_with_suffix(args[0], ".png") if args
+                                else stem+".png")
+                elif func.attr == "savefig" and args:
+                    outputs.add(args[0])
+            elif isinstance(func, ast.Name) and func.id == "open":
+                if len(args) > 1 and "w" in args[1]:
+                    outputs.add(args[0])
+    inputs = [directory / s for s in sorted(strings-outputs)
+              if "\n" not in s and s != script.name
+              and (directory / s).is_file()]
+    inputs += [PACKAGE / (m+".py") for m in sorted(_closure(tree))]
+    return Figure(script, inputs, [directory / o for o in sorted(outputs)])
+
+
+def _ignored(paths):
+    """Return the paths ignored by git, none outside of a git checkout."""
+    try:
+        result = subprocess.run(["git", "check-ignore", "--stdin"],
+                                cwd=MANUSKRIPT, capture_output=True,
+                                text=True,
+                                input="\n".join(str(p) for p in paths))
+    except OSError:
+        return set()
+    return {Path(line) for line in result.stdout.splitlines()}
+
+
+def discover(root=IMAGES):
+    """Return the figure scripts below root.
+
+    Scripts whose outputs are all ignored by git generate intermediate
+    files for other tools, like ``unicode/create_unicode_tex.py``, and are
+    skipped.
+    """
+    figures = [analyse(p) for p in sorted(root.glob("**/*.py"))]
+    ignored = _ignored([o for fig in figures for o in fig.outputs])
+    return [fig for fig in figures
+            if not fig.outputs or not set(fig.outputs) <= ignored]
+
+
+def load_stamps():
+    try:
+        return json.loads(STAMPS.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stamps(stamps):
+    STAMPS.parent.mkdir(parents=True, exist_ok=True)
+    STAMPS.write_text(json.dumps(stamps, indent=1, sort_keys=True)+"\n")
+
+
+def stale(figures, stamps, force=False):
+    """Return pairs ``(figure, digest)`` of figures which need a rebuild.
+
+    A figure is stale if one of its outputs is missing or its digest differs
+    from the recorded one.  Figures without a recorded digest, as after a
+    fresh checkout, are taken to be up to date if all outputs exist, and
+    their current digest is entered into ``stamps``.
+    """
+    result = []
+    for fig in figures:
+        digest = fig.digest()
+        if not force and fig.name not in stamps \
+                and all(o.exists() for o in fig.outputs):
+            stamps[fig.name] = digest
+        if (force or stamps.get(fig.name) != digest
+                or not all(o.exists() for o in fig.outputs)):
+            result.append((fig, digest))
+    return result
+
+
+def _environment():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(MANUSKRIPT), env.get("PYTHONPATH")) if p)
+    env.setdefault("MPLBACKEND", "Agg")
+    return env
+
+
+def run(fig):
+    """Run a figure script in its directory.
+
+    Returns a list with one pair ``(figure, stderr)`` if the script failed.
+    """
+    result = subprocess.run([sys.executable, fig.script.name],
+                            cwd=fig.script.parent, env=_environment(),
+                            capture_output=True, text=True)
+    return [(fig, result.stderr)] if result.returncode else []
+
+
+def run_latex(figs):
+    """Run figure scripts in one interpreter sharing the LaTeX engine.
+
+    Returns a list of pairs ``(figure, stderr)`` for the failed scripts.
+    """
+    result = subprocess.run([sys.executable, "-m", PACKAGE.name+".latex"]
+                            + [str(fig.script) for fig in figs],
+                            cwd=MANUSKRIPT, env=_environment(),
+                            capture_output=True, text=True)
+    try:
+        failed = set(json.loads(result.stdout.splitlines()[-1]))
+    except (IndexError, ValueError):
+        failed = {str(fig.script) for fig in figs}
+    return [(fig, result.stderr) for fig in figs if str(fig.script) in failed]
+
+
+def _stage(fig):
+    """Return a directory in which fig can run without touching its outputs.
+
+    All entries of the script's directory except the outputs are linked
+    into the new directory below ``STAGING``.
+    """
+    STAGING.mkdir(parents=True, exist_ok=True)
+    stage = Path(tempfile.mkdtemp(prefix=fig.script.stem+"-", dir=STAGING))
+    outputs = {o.relative_to(fig.script.parent).parts[0]
+               for o in fig.outputs}
+    for entry in fig.script.parent.iterdir():
+        if entry.name not in outputs:
+            (stage / entry.name).symlink_to(entry)
+    return stage
+
+
+def _commit(fig, stage, err):
+    """Move the outputs of a successful run into place.
+
+    Returns ``err`` or a message about missing outputs; the staging
+    directory is removed in any case.
+    """
+    try:
+        if err is None:
+            names = [o.relative_to(fig.script.parent) for o in fig.outputs]
+            missing = [str(n) for n in names if not (stage / n).is_file()]
+            if missing:
+                return "outputs not written: {}\n".format(", ".join(missing))
+            for name, output in zip(names, fig.outputs):
+                os.replace(stage / name, output)
+        return err
+    finally:
+        shutil.rmtree(stage, ignore_errors=True)
+
+
+def run_staged(execute, figs, jobs=None):
+    """Run the scripts by ``execute`` in staging directories.
+
+    Failing scripts leave their previous outputs untouched.  Yields the
+    pairs of ``execute`` for the original figures.
+    """
+    stages = {}
+    try:
+        staged = []
+        for fig in figs:
+            stage = _stage(fig)
+            copy = replace(fig, script=stage / fig.script.name)
+            stages[str(copy.script)] = fig, stage
+            staged.append(copy)
+        for _, timings in execute(staged, jobs):
+            task = []
+            results = []
+            for script, err, startup, render in timings:
+                fig, stage = stages.pop(script)
+                task.append(fig)
+                results.append((str(fig.script), _commit(fig, stage, err),
+                                startup, render))
+            yield task, results
+    finally:
+        for fig, stage in stages.values():
+            shutil.rmtree(stage, ignore_errors=True)
+
+
+def uses_latex(fig):
+    return PACKAGE / "latex.py" in fig.inputs
+
+
+def _execute(conn, scripts, shared):
+    """Execute scripts in this forked process.
+
+    With ``shared`` the scripts use the shared LaTeX engine and are run by
+    ``eidprog.latex.run``.  Sends a list of tuples
+    ``(script, stderr or None, start, end)`` through the connection.
+    """
+    from . import latex
+
+    results = []
+    for script in scripts:
+        start = time.time()
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            if shared:
+                failed = latex.run([script])
+            else:
+                failed = []
+                os.chdir(Path(script).parent)
+                try:
+                    runpy.run_path(script, run_name="__main__")
+                except SystemExit as e:
+                    if e.code:
+                        traceback.print_exc()
+                        failed = [script]
+                except BaseException:
+                    traceback.print_exc()
+                    failed = [script]
+        results.append((script, err.getvalue() if failed else None,
+                        start, time.time()))
+    conn.send(results)
+    conn.close()
+
+
+def run_preloaded(figs, jobs=None):
+    """Run the scripts in processes forked from a preloaded server.
+
+    Every script not using LaTeX gets a process of its own, the LaTeX
+    scripts share one.  Yields pairs of the list of figures run by a process
+    and the list of tuples ``(script, stderr or None, startup, render)``.
+    """
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(PRELOAD)
+    tasks = [[fig] for fig in figs if not uses_latex(fig)]
+    batch = [fig for fig in figs if uses_latex(fig)]
+    if batch:
+        tasks.insert(0, batch)
+    jobs = jobs or os.cpu_count()
+    running = {}
+    while tasks or running:
+        while tasks and len(running) < jobs:
+            task = tasks.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_execute,
+                args=(sender, [str(fig.script) for fig in task],
+                      uses_latex(task[0])))
+            spawned = time.time()
+            process.start()
+            sender.close()
+            running[receiver] = (process, task, spawned)
+        # the receivers become ready when results arrive or a process dies;
+        # the results are read before joining, since a child cannot exit
+        # before the pipe has taken its results
+        for receiver in multiprocessing.connection.wait(list(running)):
+            process, task, spawned = running.pop(receiver)
+            try:
+                results = receiver.recv()
+            except (EOFError, OSError):
+                results = None
+            receiver.close()
+            process.join()
+            if results is None:
+                results = [(str(fig.script),
+                            "process terminated with exit code {}\n".format(
+                                process.exitcode), spawned, spawned)
+                           for fig in task]
+            timings = []
+            for script, err, start, end in results:
+                timings.append((script, err, start-spawned, end-start))
+                spawned = end
+            yield task, timings
+
+
+def run_subprocesses(figs, jobs=None):
+    """Run every script in a new interpreter, the LaTeX scripts together.
+
+    Yields the same pairs as ``run_preloaded`` without times.
+    """
+    batch = [fig for fig in figs if uses_latex(fig)]
+    with concurrent.futures.ThreadPoolExecutor(jobs or os.cpu_count()) as ex:
+        futures = {ex.submit(run, fig): [fig]
+                   for fig in figs if not uses_latex(fig)}
+        if batch:
+            futures[ex.submit(run_latex, batch)] = batch
+        for future in concurrent.futures.as_completed(futures):
+            errors = {fig.script: err for fig, err in future.result()}
+            task = futures[future]
+            yield task, [(str(fig.script), errors.get(fig.script), None, None)
+                         for fig in task]
+
+
+def _collect(results, stamps, digests):
+    """Report the results of the scripts and return the number of failures.
+
+    The times of the tuples ``(script, stderr or None, startup, render)``
+    are None if they were not measured.
+    """
+    failures = 0
+    for task, timings in results:
+        figs = {str(fig.script): fig for fig in task}
+        for script, err, startup, render in timings:
+            fig = figs[script]
+            if err is not None:
+                failures = failures+1
+                print("failed", fig.name, file=sys.stderr)
+                sys.stderr.write(err)
+                continue
+            if startup is None:
+                print("built", fig.name)
+            else:
+                print("built {} (startup {:.0f} ms, render {:.0f} ms)".format(
+                      fig.name, 1000*startup, 1000*render))
+            stamps[fig.name] = digests[fig.name]
+    return failures
+
+
+def build(force=False, jobs=None, dry_run=False, preload=True):
+    """Rebuild all stale figures and return the number of failures."""
+    stamps = load_stamps()
+    figures = discover()
+    recorded = dict(stamps)
+    missing = raster.unlisted([o.relative_to(IMAGES).as_posix()
+                               for fig in figures for o in fig.outputs])
+    for name in missing:
+        print("no entry for {} in {}".format(name, raster.METADATA.name),
+              file=sys.stderr)
+    todo = stale(figures, stamps, force)
+    if dry_run:
+        for fig, _ in todo:
+            print(fig.name)
+        return len(missing)+raster.build(force, jobs, dry_run)
+    digests = {fig.name: digest for fig, digest in todo}
+    figs = [fig for fig, _ in todo]
+    execute = run_preloaded if preload else run_subprocesses
+    failures = (_collect(run_staged(execute, figs, jobs), stamps, digests)
+                if figs else 0)
+    if stamps != recorded:
+        save_stamps(stamps)
+    return len(missing)+failures+raster.build(force, jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild all figures")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of scripts run in parallel")
+    parser.add_argument("--dry-run", "-n", action="store_true",
+                        help="only list the stale figures")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="run every script in a new interpreter")
+    args = parser.parse_args(argv)
+    return 1 if build(args.force, args.jobs, args.dry_run, args.preload) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
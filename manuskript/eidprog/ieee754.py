@@ -0,0 +1,169 @@
+"""Inspection of IEEE 754 floating point numbers in bulk.
+
+Arrays of type float64 or float32 are reinterpreted without copying as
+unsigned integers of the same size by ``bits``.  From these the sign bit
+``S``, the biased exponent ``E`` and the trailing significand ``T`` are
+extracted with shifts and masks for all elements at once, and the values
+are classified as zero, subnormal, normal, infinite or NaN.
+
+``ulp_distance`` counts the representable numbers between two arrays of
+floats.  It maps the bit patterns to unsigned integers which are ordered
+like the floating point numbers they represent, with both zeros mapped to
+the same integer, and takes the difference.
+
+``diagram`` draws the layout of the fields shown in the appendix on
+floating point numbers with PyX.  Given a value, the fields are labelled
+with its sign bit, its exponent in decimal and its significand in
+hexadecimal.
+"""
+
+import numpy as np
+
+#: fields of the formats: unsigned type, exponent bits, significand bits
+FORMATS = {np.dtype(np.float64): (np.uint64, 11, 52),
+           np.dtype(np.float32): (np.uint32, 8, 23)}
+
+ZERO, SUBNORMAL, NORMAL, INFINITE, NAN = range(5)
+CLASSES = ("zero", "subnormal", "normal", "infinite", "nan")
+
+
+def _format(x):
+    try:
+        return FORMATS[x.dtype]
+    except KeyError:
+        raise TypeError("unsupported type {}".format(x.dtype)) from None
+
+
+def bits(x):
+    """Return the bit patterns of the float array ``x`` as unsigned view."""
+    x = np.asarray(x)
+    uint, _, _ = _format(x)
+    return x.view(uint)
+
+
+def decompose(x):
+    """Return sign bit, biased exponent and trailing significand of x."""
+    x = np.asarray(x)
+    uint, ebits, tbits = _format(x)
+    b = bits(x)
+    sign = (b >> uint(ebits+tbits)).astype(np.uint8)
+    exponent = ((b >> uint(tbits)) & uint((1 << ebits)-1)).astype(np.uint16)
+    significand = b & uint((1 << tbits)-1)
+    return sign, exponent, significand
+
+
+def classify(x):
+    """Return the class of every element as one of the constants ZERO etc."""
+    x = np.asarray(x)
+    _, ebits, _ = _format(x)
+    _, exponent, significand = decompose(x)
+    emax = (1 << ebits)-1
+    result = np.full(x.shape, NORMAL, dtype=np.uint8)
+    result[exponent == 0] = SUBNORMAL
+    result[(exponent == 0) & (significand == 0)] = ZERO
+    result[exponent == emax] = NAN
+    result[(exponent == emax) & (significand == 0)] = INFINITE
+    return result
+
+
+def counts(x):
+    """Return the number of elements in every class as dictionary."""
+    n = np.bincount(classify(x).ravel(), minlength=len(CLASSES))
+    return dict(zip(CLASSES, n.tolist()))
+
+
+def _ordered(x):
+    uint, ebits, tbits = _format(x)
+    b = bits(x)
+    signbit = uint(1 << (ebits+tbits))
+    magnitude = b & ~signbit
+    return np.where(b & signbit, signbit-magnitude, signbit+magnitude)
+
+
+def ulp_distance(a, b):
+    """Return the number of representable numbers from a to b.
+
+    The result is an unsigned integer array; it is zero for equal numbers
+    including ``+0.0`` and ``-0.0``.  If one of the numbers is NaN, the
+    largest unsigned integer is returned.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    if a.dtype != b.dtype:
+        raise TypeError("arrays of different types")
+    oa = _ordered(a)
+    ob = _ordered(b)
+    distance = np.where(oa > ob, oa-ob, ob-oa)
+    distance[np.isnan(a) | np.isnan(b)] = np.iinfo(distance.dtype).max
+    return distance
+
+
+def diagram(value=None, dtype=np.float64, b=0.8):
+    """Return a canvas with the layout of the floating point format.
+
+    Without ``value`` the fields are labelled S, E and T.  The LaTeX
+    engine and the unit scaling have to be set up by the caller.
+    """
+    from pyx import canvas, path, style, text
+
+    from . import latex
+
+    dtype = np.dtype(dtype)
+    _, ebits, tbits = FORMATS[dtype]
+    if value is None:
+        labels = ("S", "E", "T")
+    else:
+        sign, exponent, significand = decompose(np.asarray(value, dtype))
+        labels = (str(int(sign)), str(int(exponent)),
+                  "{:0{}X}".format(int(significand), (tbits+3)//4))
+
+    def opening(offset):
+        c.stroke(path.path(path.moveto(offset+0.5*b, b),
+                           path.lineto(offset, b),
+                           path.lineto(offset, 0),
+                           path.lineto(offset+0.5*b, 0)))
+
+    def closing(offset):
+        c.stroke(path.path(path.moveto(offset, b),
+                           path.lineto(offset+0.5*b, b),
+                           path.lineto(offset+0.5*b, 0),
+                           path.lineto(offset, 0)))
+
+    def pointer(offset, depth, name):
+        c.stroke(path.path(path.moveto(offset+0.1*b, -0.1),
+                           path.lineto(offset+0.1*b, -depth),
+                           path.lineto(offset+0.3*b, -depth)),
+                 [style.linewidth.thin])
+        latex.label(c, offset+0.2*b, 0.1-depth, r"\sffamily "+name)
+
+    def field(offset, width, nbits, label):
+        c.stroke(path.line(offset, 0, offset+width, 0),
+                 [style.linestyle.dotted])
+        c.stroke(path.line(offset, b, offset+width, b),
+                 [style.linestyle.dotted])
+        latex.label(c, offset+0.5*width, 1.1*b,
+                    r"\sffamily {} Bits".format(nbits), [text.halign.center])
+        latex.label(c, offset+0.5*width, 0.5*b, r"\sffamily "+label,
+                    [text.halign.center, text.valign.middle])
+
+    c = canvas.canvas()
+    offset = 0
+    c.stroke(path.rect(offset, 0, b, b))
+    pointer(offset, 1.2, "Vorzeichen")
+    latex.label(c, 0.5*b, 1.1*b, r"\sffamily 1 Bit", [text.halign.center])
+    latex.label(c, 0.5*b, 0.5*b, r"\sffamily "+labels[0],
+                [text.halign.center, text.valign.middle])
+    offset = 1.2*b
+    opening(offset)
+    pointer(offset, 0.7, "Exponent")
+    offset = offset+0.5*b
+    field(offset, b, ebits, labels[1])
+    offset = offset+b
+    closing(offset)
+    offset = offset+0.7*b
+    opening(offset)
+    pointer(offset, 0.7, "Mantisse")
+    offset = offset+0.5*b
+    field(offset, 5*b, tbits, labels[2])
+    offset = offset+5*b
+    closing(offset)
+    return c
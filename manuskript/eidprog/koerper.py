@@ -0,0 +1,134 @@
+"""Many mass points and rigid bodies of revolution moved at once.
+
+``Ensemble`` stores the positions and axes of ``n`` bodies in contiguous
+arrays of shape ``(n, 3)``.  Translations and rotations act on all bodies
+or on the subset selected by ``maske`` (a boolean array or an array of
+indices) in a single vectorized operation.  Optionally, the orientation of
+each body is kept as a unit quaternion.  Successive rotations are then
+composed as quaternions, which are renormalized after each step, and the
+axes are derived from them, so that the length of the axes does not drift.
+
+The classes ``Massepunkt`` and ``Rotationskoerper`` of the chapter on
+object oriented programming are views onto one row of an ensemble.  Created
+without an ensemble, they get one of their own.
+"""
+
+from math import pi
+
+import numpy as np
+
+
+def _normalized(v):
+    v = np.asarray(v, dtype=float)
+    return v/np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def _quaternion_product(p, q):
+    pw, pv = p[..., :1], p[..., 1:]
+    qw, qv = q[..., :1], q[..., 1:]
+    w = pw*qw-np.sum(pv*qv, axis=-1, keepdims=True)
+    v = pw*qv+qw*pv+np.cross(pv, qv)
+    return np.concatenate((w, v), axis=-1)
+
+
+def _quaternion_rotate(q, v):
+    w, u = q[..., :1], q[..., 1:]
+    t = 2*np.cross(u, v)
+    return v+w*t+np.cross(u, t)
+
+
+class Ensemble:
+
+    def __init__(self, n, quaternionen=False):
+        self.pos = np.zeros((n, 3))
+        self.achse = np.zeros((n, 3))
+        self.achse[:, 2] = 1
+        if quaternionen:
+            self.quaternion = np.zeros((n, 4))
+            self.quaternion[:, 0] = 1
+            self.achse0 = self.achse.copy()
+        else:
+            self.quaternion = None
+
+    def __len__(self):
+        return len(self.pos)
+
+    @staticmethod
+    def _auswahl(maske):
+        return slice(None) if maske is None else maske
+
+    def verschiebe(self, shift, maske=None):
+        """Shift the selected bodies by a vector or by one vector each."""
+        self.pos[self._auswahl(maske)] += shift
+
+    def drehe(self, drehachse, winkel, maske=None):
+        """Rotate the axes of the selected bodies.
+
+        ``drehachse`` is a single vector or one vector per selected body,
+        ``winkel`` a single angle or one angle per selected body in degrees.
+        """
+        auswahl = self._auswahl(maske)
+        k = _normalized(drehachse)
+        winkel = np.asarray(winkel, dtype=float)[..., np.newaxis]*pi/180
+        if self.quaternion is not None:
+            halb = winkel/2
+            w = np.broadcast_to(np.cos(halb), k.shape[:-1]+(1,))
+            rot = np.concatenate((w, k*np.sin(halb)), axis=-1)
+            q = _quaternion_product(rot, self.quaternion[auswahl])
+            q = _normalized(q)
+            self.quaternion[auswahl] = q
+            self.achse[auswahl] = _quaternion_rotate(q, self.achse0[auswahl])
+        else:
+            a = self.achse[auswahl]
+            c = np.cos(winkel)
+            s = np.sin(winkel)
+            kdota = np.sum(k*a, axis=-1, keepdims=True)
+            self.achse[auswahl] = a*c+k*kdota*(1-c)+np.cross(k, a)*s
+
+    def massepunkt(self, index):
+        return Massepunkt(self, index)
+
+    def rotationskoerper(self, index):
+        return Rotationskoerper(self, index)
+
+
+class Massepunkt:
+
+    __slots__ = ("ensemble", "index")
+
+    def __init__(self, ensemble=None, index=0):
+        if ensemble is None:
+            ensemble = Ensemble(1)
+        self.ensemble = ensemble
+        self.index = index
+
+    @property
+    def pos(self):
+        return self.ensemble.pos[self.index]
+
+    @pos.setter
+    def pos(self, value):
+        self.ensemble.pos[self.index] = value
+
+    def verschiebe(self, shift):
+        self.ensemble.pos[self.index] += shift
+
+    def position(self):
+        print("Die Masse befindet sich am Ort "
+              "({:g}, {:g}, {:g}).".format(*self.pos))
+
+
+class Rotationskoerper(Massepunkt):
+
+    __slots__ = ()
+
+    @property
+    def achse(self):
+        return self.ensemble.achse[self.index]
+
+    def drehe(self, drehachse, winkel):
+        self.ensemble.drehe(drehachse, winkel, [self.index])
+
+    def orientierung(self):
+        print("Die Achse des starren Körpers liegt in Richtung "
+              "des Vektors ({:g}, {:g}, {:g}).".format(*self.achse))
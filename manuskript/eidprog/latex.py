@@ -0,0 +1,101 @@
+"""Shared LaTeX typesetting for the PyX figure scripts.
+
+PyX starts a separate LaTeX process for every script and typesets every
+label anew, even if the same label like ``\\sffamily 0`` occurs dozens of
+times.  ``engine`` returns a LaTeX engine which is created once per process
+and installed as PyX default, so that ``c.text`` and graphs use it as well.
+It runs in ``texipc`` mode, where each box is read from the DVI output
+immediately, so that the LaTeX process survives writing a canvas and can be
+used by several scripts in turn.  ``box`` and ``label`` cache the typeset
+boxes keyed by the LaTeX string, its attributes, the preamble, the engine
+settings and the unit scales.
+
+Running this module with a list of figure scripts executes them one after
+another in one process with a shared engine::
+
+    python -m eidprog.latex images/integers/binary.py images/utf8/utf8_2.py
+
+The last line of the output is a JSON list of the scripts that failed.
+"""
+
+import json
+import os
+import runpy
+import sys
+import traceback
+from pathlib import Path
+
+from pyx import text, trafo, unit
+
+_engines = {}
+_boxes = {}
+
+
+def engine(preamble="", **kwargs):
+    """Return the shared LaTeX engine and make it the PyX default."""
+    kwargs.setdefault("texipc", True)
+    key = (preamble, tuple(sorted(kwargs.items())))
+    e = _engines.get(key)
+    if e is None:
+        e = _engines[key] = text.LatexEngine(**kwargs)
+        if preamble:
+            e.preamble(preamble)
+    if text.defaulttextengine is not e:
+        text.defaulttextengine = e
+        text.preamble = e.preamble
+        text.text_pt = e.text_pt
+        text.text = e.text
+        text.reset = e.reset
+    return e
+
+
+def box(expr, attrs=(), preamble="", **kwargs):
+    """Return the typeset box for ``expr`` positioned at the origin."""
+    e = engine(preamble, **kwargs)
+    key = (expr, tuple(attrs), id(e), tuple(sorted(unit.scale.items())))
+    b = _boxes.get(key)
+    if b is None:
+        b = _boxes[key] = e.text(0, 0, expr, list(attrs))
+    return b
+
+
+def label(c, x, y, expr, attrs=(), preamble="", **kwargs):
+    """Insert the box for ``expr`` at position ``(x, y)`` into canvas ``c``.
+
+    This replaces ``c.text(x, y, expr, attrs)``.
+    """
+    b = box(expr, attrs, preamble, **kwargs)
+    c.insert(b, [trafo.translate(x, y)])
+    return b
+
+
+def run(scripts):
+    """Run figure scripts in this process and return the failed ones.
+
+    Every script is executed in its own directory.  The unit settings are
+    restored afterwards, so that for example ``unit.set(xscale=1.3)`` does
+    not affect the following scripts.
+    """
+    failed = []
+    cwd = os.getcwd()
+    for script in scripts:
+        script = Path(script).absolute()
+        scale = dict(unit.scale)
+        defaultunit = unit._default_unit
+        try:
+            os.chdir(script.parent)
+            runpy.run_path(script.name, run_name="__main__")
+        except Exception:
+            traceback.print_exc()
+            failed.append(str(script))
+        finally:
+            os.chdir(cwd)
+            unit.scale.update(scale)
+            unit._default_unit = defaultunit
+    return failed
+
+
+if __name__ == "__main__":
+    failed = run(sys.argv[1:])
+    print(json.dumps(failed))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,292 @@
+"""Sphinx extension executing program listings and showing their output.
+
+A listing marked by the directive ``programm`` is displayed like a
+``code-block:: python``, accepting the same options, and executed in a
+separate Python interpreter with the source directory as working
+directory.  The directive ``programmausgabe`` following it shows what the
+program printed::
+
+    .. programm::
+       :linenos:
+
+       print("** Anfang")
+
+    .. programmausgabe::
+
+If ``programmausgabe`` has a content, the content is displayed and compared
+with the actual output; differences are reported as warnings.  A line
+consisting of ``[…]`` in the content stands for any number of omitted
+lines.  With the flag ``:ersetzen:`` the actual output is displayed
+instead.
+
+The output of every listing is cached in ``listings`` next to the doctree
+directory under a hash of the code, the Python version and the versions of
+the packages named in ``listings_packages``, so that unchanged listings are
+not executed again.  Before documents are read, their sources are scanned
+for listings, and those not in the cache are started in parallel, at most
+``listings_jobs`` at a time, while reading proceeds.  A document waits for
+its listings only when it is written, and listings running longer than
+``listings_timeout`` seconds are terminated with a warning.
+
+Writing a document waits at most ``listings_wait`` seconds for each of its
+listings.  A listing not finished by then is shown with the content of
+``programmausgabe``, or with ``[…]`` if there is none, and a warning.  If
+it has already started, it runs to completion before Sphinx exits, and its
+output is cached for the next build.
+
+Failing listings and listings which timed out are cached as well, so that
+they cost time only once.  A timed out listing is run again if
+``listings_timeout`` is raised; to rerun failed listings, for example after
+installing a missing package, the directory ``listings`` has to be removed.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import textwrap
+from importlib import metadata
+from pathlib import Path
+
+from docutils import nodes
+from docutils.parsers.rst import directives
+from sphinx.directives.code import CodeBlock
+from sphinx.util import logging
+from sphinx.util.docutils import SphinxDirective
+
+logger = logging.getLogger(__name__)
+
+ELLIPSIS = "[…]"
+_DIRECTIVE = re.compile(r"^(\s*)\.\. programm::\s*$")
+
+
+class programmausgabe(nodes.General, nodes.Element):
+    """Placeholder replaced by the output of a listing before writing."""
+
+
+class Programm(CodeBlock):
+    optional_arguments = 0
+
+    def run(self):
+        self.env.temp_data["eidprog_programm"] = "\n".join(self.content)
+        self.arguments = ["python"]
+        return super().run()
+
+
+class Programmausgabe(SphinxDirective):
+    has_content = True
+    option_spec = {"ersetzen": directives.flag}
+
+    def run(self):
+        code = self.env.temp_data.get("eidprog_programm")
+        if code is None:
+            raise self.error("programmausgabe without preceding programm")
+        node = programmausgabe()
+        node["code"] = code
+        node["expected"] = "\n".join(self.content) if self.content else None
+        node["replace"] = "ersetzen" in self.options
+        self.set_source_info(node)
+        return [node]
+
+
+def _environment(config):
+    versions = [sys.version]
+    for package in config.listings_packages:
+        try:
+            versions.append("{} {}".format(package, metadata.version(package)))
+        except metadata.PackageNotFoundError:
+            versions.append(package)
+    return "\n".join(versions)
+
+
+def _execute(code, cwd, timeout):
+    env = dict(os.environ, MPLBACKEND="Agg")
+    try:
+        proc = subprocess.run([sys.executable, "-"], input=code, cwd=cwd,
+                              env=env, capture_output=True, text=True,
+                              timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"timeout": timeout}
+    return {"stdout": proc.stdout, "stderr": proc.stderr,
+            "returncode": proc.returncode}
+
+
+class Runner:
+    """Execute listings in parallel and cache their output."""
+
+    def __init__(self, app):
+        self.srcdir = str(app.srcdir)
+        self.cache = Path(app.doctreedir).parent / "listings"
+        self.environment = _environment(app.config)
+        self.timeout = app.config.listings_timeout
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            app.config.listings_jobs or os.cpu_count())
+        self.futures = {}
+
+    def key(self, code):
+        data = (self.environment+"\0"+code).encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def _run(self, key, code):
+        result = _execute(code, self.srcdir, self.timeout)
+        self.cache.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache / (key+".tmp")
+        tmp.write_text(json.dumps(result), encoding="utf-8")
+        tmp.replace(self.cache / (key+".json"))
+        return result
+
+    def _cached(self, key):
+        """Return the cached result unless it is a shorter timeout."""
+        try:
+            result = json.loads((self.cache / (key+".json"))
+                                .read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if result.get("timeout", self.timeout) < self.timeout:
+            return None
+        return result
+
+    def submit(self, code):
+        """Start the listing unless its output is known or pending."""
+        key = self.key(code)
+        if key not in self.futures and self._cached(key) is None:
+            self.futures[key] = self.executor.submit(self._run, key, code)
+
+    def result(self, code, wait=None):
+        """Return the result, or None if the listing takes longer than wait."""
+        key = self.key(code)
+        if key not in self.futures:
+            result = self._cached(key)
+            if result is not None:
+                return result
+        self.submit(code)
+        try:
+            return self.futures[key].result(timeout=wait)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def listings(source):
+    """Return the code of all listings marked by ``programm`` in source."""
+    lines = source.splitlines()
+    result = []
+    for n, line in enumerate(lines):
+        match = _DIRECTIVE.match(line)
+        if not match:
+            continue
+        indent = len(match.group(1))
+        body = []
+        for line in lines[n+1:]:
+            if line.strip() and len(line)-len(line.lstrip()) <= indent:
+                break
+            body.append(line)
+        body = [line.expandtabs(8).rstrip() for line in body]
+        body = textwrap.dedent("\n".join(body)).splitlines()
+        while body and (body[0].startswith(":") or not body[0].strip()):
+            body.pop(0)
+        while body and not body[-1].strip():
+            body.pop()
+        result.append("\n".join(body))
+    return result
+
+
+def builder_inited(app):
+    app.eidprog_listings = Runner(app)
+
+
+def env_before_read_docs(app, env, docnames):
+    runner = app.eidprog_listings
+    for docname in docnames:
+        try:
+            source = Path(env.doc2path(docname)).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for code in listings(source):
+            runner.submit(code)
+
+
+def _matches(expected, actual):
+    """Compare line by line, where ELLIPSIS matches any number of lines."""
+    expected = [line.rstrip() for line in expected.strip("\n").splitlines()]
+    actual = [line.rstrip() for line in actual.strip("\n").splitlines()]
+    parts = [[]]
+    for line in expected:
+        if line.strip() == ELLIPSIS:
+            parts.append([])
+        else:
+            parts[-1].append(line)
+    if len(parts) == 1:
+        return expected == actual
+    first, *middle, last = parts
+    if actual[:len(first)] != first or \
+            len(actual) < len(first)+len(last) or \
+            actual[len(actual)-len(last):] != last:
+        return False
+    position = len(first)
+    stop = len(actual)-len(last)
+    for part in middle:
+        while actual[position:position+len(part)] != part:
+            position = position+1
+            if position+len(part) > stop:
+                return False
+        position = position+len(part)
+    return position <= stop
+
+
+def doctree_resolved(app, doctree, docname):
+    runner = app.eidprog_listings
+    for node in list(doctree.findall(programmausgabe)):
+        result = runner.result(node["code"], app.config.listings_wait)
+        expected = node["expected"]
+        if result is None:
+            logger.warning("listing still running after %s s, output "
+                           "not shown", app.config.listings_wait,
+                           location=node)
+            actual = None
+        elif result.get("timeout"):
+            logger.warning("listing did not finish within %s s",
+                           result["timeout"], location=node)
+            actual = None
+        elif result["returncode"]:
+            logger.warning("listing failed:\n%s", result["stderr"],
+                           location=node)
+            actual = result["stdout"]
+        else:
+            actual = result["stdout"]
+        if expected is not None and actual is not None \
+                and not _matches(expected, actual):
+            logger.warning("output of listing differs:\n%s", actual,
+                           location=node)
+        if expected is None or (node["replace"] and actual is not None):
+            text = ELLIPSIS if actual is None else actual.rstrip("\n")
+        else:
+            text = expected
+        block = nodes.literal_block(text, text)
+        block["language"] = "none"
+        block.source, block.line = node.source, node.line
+        node.replace_self(block)
+
+
+def build_finished(app, exception):
+    app.eidprog_listings.shutdown()
+
+
+def setup(app):
+    app.add_config_value("listings_timeout", 120, "env")
+    app.add_config_value("listings_wait", 10, "env")
+    app.add_config_value("listings_jobs", None, "env")
+    app.add_config_value("listings_packages", ("numpy", "scipy"), "env")
+    app.add_node(programmausgabe)
+    app.add_directive("programm", Programm)
+    app.add_directive("programmausgabe", Programmausgabe)
+    app.connect("builder-inited", builder_inited)
+    app.connect("env-before-read-docs", env_before_read_docs)
+    app.connect("doctree-resolved", doctree_resolved)
+    app.connect("build-finished", build_finished)
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
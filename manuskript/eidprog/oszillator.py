@@ -0,0 +1,150 @@
+"""Parameter sweeps for the damped harmonic oscillator.
+
+The chapter on SciPy solves the equations of motion
+
+    dx/dt = p,    dp/dt = -x - gamma*p
+
+with ``integrate.odeint`` for a single damping constant.  Here many
+independent oscillators, given by a damping constant and the initial
+conditions each, are solved at once.  Up to ``batch`` of them are packed
+into one system of differential equations whose right-hand side is
+evaluated with array operations.  The variables are interleaved as
+``x0, p0, x1, p1, ...``, so that the Jacobian is a band matrix with one
+diagonal above and below the main diagonal which is passed to ``odeint``
+explicitly.  Since LSODA controls the error in the maximum norm, every
+oscillator is solved at least as accurately as on its own.
+
+The batches are distributed over a pool of worker processes and the results
+are written, as they arrive, into a single ``.npy`` file holding a float
+array of shape ``(3+2*npts, n)``, one row per column of the result table:
+the damping constants, the initial positions and momenta, the positions
+at the ``npts`` time points and the momenta at these time points.  Every
+quantity is thus stored contiguously and can be read through a memory map
+with ``load``.
+
+Usage, from the directory ``manuskript``::
+
+    python -m eidprog.oszillator [-j N] [--gamma START STOP NUM] OUTPUT
+"""
+
+import argparse
+import concurrent.futures
+
+import numpy as np
+from scipy import integrate
+
+
+def ableitung(y, t, gamma):
+    """Return the time derivative of the interleaved state vector."""
+    dy = np.empty_like(y)
+    dy[0::2] = y[1::2]
+    dy[1::2] = -y[0::2]-gamma*y[1::2]
+    return dy
+
+
+def jacobi(y, t, gamma):
+    """Return the band of the Jacobian in the layout expected by odeint."""
+    jac = np.zeros((3, len(y)))
+    jac[0, 1::2] = 1
+    jac[1, 1::2] = -gamma
+    jac[2, 0::2] = -1
+    return jac
+
+
+def grid(gamma, x0=0.0, p0=1.0):
+    """Return all combinations of the given parameters as flat arrays."""
+    g, x, p = np.meshgrid(gamma, x0, p0, indexing="ij")
+    return g.ravel(), x.ravel(), p.ravel()
+
+
+def solve(gamma, x0, p0, pts, rtol=None, atol=None):
+    """Solve the oscillators and return positions and momenta.
+
+    The results have shape ``(len(gamma), len(pts))``.
+    """
+    gamma = np.asarray(gamma, dtype=float)
+    y0 = np.empty(2*len(gamma))
+    y0[0::2] = x0
+    y0[1::2] = p0
+    y = integrate.odeint(ableitung, y0, pts, (gamma,), Dfun=jacobi,
+                         ml=1, mu=1, rtol=rtol, atol=atol)
+    return y[:, 0::2].T, y[:, 1::2].T
+
+
+def _solve_batch(start, gamma, x0, p0, pts, rtol, atol):
+    return start, solve(gamma, x0, p0, pts, rtol, atol)
+
+
+def sweep(filename, gamma, x0, p0, pts, batch=256, jobs=None,
+          rtol=None, atol=None):
+    """Solve all oscillators and store the results in ``filename``.
+
+    ``gamma``, ``x0`` and ``p0`` are broadcast against each other.  With
+    ``jobs=1`` all batches are solved in the calling process.
+    """
+    gamma, x0, p0 = (np.ravel(a).astype(float)
+                     for a in np.broadcast_arrays(gamma, x0, p0))
+    n = len(gamma)
+    npts = len(pts)
+    out = np.lib.format.open_memmap(filename, mode="w+", dtype=float,
+                                    shape=(3+2*npts, n))
+    out[0] = gamma
+    out[1] = x0
+    out[2] = p0
+    tasks = [(start, gamma[start:start+batch], x0[start:start+batch],
+              p0[start:start+batch], pts, rtol, atol)
+             for start in range(0, n, batch)]
+    if jobs == 1:
+        results = (_solve_batch(*task) for task in tasks)
+        _store(out, results, npts)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(jobs) as ex:
+            futures = [ex.submit(_solve_batch, *task) for task in tasks]
+            results = (f.result()
+                       for f in concurrent.futures.as_completed(futures))
+            _store(out, results, npts)
+    out.flush()
+    del out
+
+
+def _store(out, results, npts):
+    for start, (x, p) in results:
+        end = start+x.shape[0]
+        out[3:3+npts, start:end] = x.T
+        out[3+npts:, start:end] = p.T
+
+
+def load(filename):
+    """Return the columns of a result file as memory-mapped arrays.
+
+    The result is a dictionary with the damping constants ``gamma``, the
+    initial conditions ``x0`` and ``p0`` and the arrays ``x`` and ``p`` of
+    shape ``(npts, n)``.
+    """
+    a = np.load(filename, mmap_mode="r")
+    npts = (a.shape[0]-3)//2
+    return {"gamma": a[0], "x0": a[1], "p0": a[2],
+            "x": a[3:3+npts], "p": a[3+npts:]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="name of the .npy file")
+    parser.add_argument("--gamma", type=float, nargs=3,
+                        default=(0.0, 2.0, 1000),
+                        metavar=("START", "STOP", "NUM"),
+                        help="grid of damping constants")
+    parser.add_argument("--tmax", type=float, default=10.0)
+    parser.add_argument("--npts", type=int, default=101)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of worker processes")
+    args = parser.parse_args(argv)
+    start, stop, num = args.gamma
+    gamma, x0, p0 = grid(np.linspace(start, stop, int(num)))
+    pts = np.linspace(0, args.tmax, args.npts)
+    sweep(args.output, gamma, x0, p0, pts, args.batch, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Prime numbers for large ranges.
+
+``segments`` runs a segmented sieve of Eratosthenes over the odd numbers of
+an interval.  Only the primes up to the square root of the upper bound and
+one segment are held in memory at any time, so that primes up to 10**10
+and beyond can be enumerated or counted.  The segments are yielded as bit
+arrays packed with ``np.packbits``, one bit per odd number.
+
+``PrimeTable`` keeps all primes up to a limit in a sorted array which grows
+on demand, up to ``maxlimit``, but only for numbers close to its current
+limit.  Membership tests, primes in an interval and the n-th prime are
+found by binary search.  Beyond the table ``is_prime`` uses the
+Miller-Rabin test, which is deterministic for n < 3.3*10**24 with the
+bases used here, in particular for all 64 bit integers, and
+``primes_between`` sieves the interval alone.
+
+The module level functions ``is_prime``, ``primes_between`` and
+``nth_prime`` share one table.
+"""
+
+import math
+
+import numpy as np
+
+SEGMENT = 2**22
+# the table is only extended for numbers below GROWTH times its limit
+GROWTH = 4
+_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def small_primes(limit):
+    """Return the primes below ``limit`` with a simple sieve."""
+    if limit <= 2:
+        return np.zeros(0, dtype=np.int64)
+    sieve = np.ones(limit, dtype=bool)
+    sieve[:2] = False
+    sieve[4::2] = False
+    for p in range(3, math.isqrt(limit-1)+1, 2):
+        if sieve[p]:
+            sieve[p*p::2*p] = False
+    return np.flatnonzero(sieve).astype(np.int64)
+
+
+def _sieve_odd(start, stop, base):
+    """Mark the primes among the odd numbers ``start, start+2, ... < stop``.
+
+    ``start`` must be odd, ``base`` must contain all odd primes up to the
+    square root of ``stop``.
+    """
+    flags = np.ones((stop-start+1)//2, dtype=bool)
+    for p in base[:np.searchsorted(base, math.isqrt(stop-1), "right")]:
+        p = int(p)
+        first = max(p*p, -(-start//p)*p)
+        if first % 2 == 0:
+            first = first+p
+        flags[(first-start)//2::p] = False
+    if start == 1:
+        flags[0] = False
+    return flags
+
+
+def segments(lo, hi, size=SEGMENT):
+    """Yield ``(start, bits)`` for the odd numbers in ``[lo, hi)``.
+
+    Bit ``i`` of the packed array ``bits`` is set if ``start+2*i`` is prime.
+    The prime 2 is not contained in any segment.
+    """
+    start = max(lo, 3) | 1
+    if start >= hi:
+        return
+    base = small_primes(math.isqrt(hi-1)+1)[1:]
+    while start < hi:
+        stop = min(start+2*size, hi)
+        yield start, np.packbits(_sieve_odd(start, stop, base))
+        start = stop | 1
+
+
+def iter_primes(lo, hi, size=SEGMENT):
+    """Yield arrays of the primes in ``[lo, hi)``, one per segment."""
+    if lo <= 2 < hi:
+        yield np.array([2], dtype=np.int64)
+    for start, bits in segments(lo, hi, size):
+        n = (min(start+2*size, hi)-start+1)//2
+        flags = np.unpackbits(bits, count=n).astype(bool)
+        yield start+2*np.flatnonzero(flags).astype(np.int64)
+
+
+def count_primes(lo, hi, size=SEGMENT):
+    """Return the number of primes in ``[lo, hi)``."""
+    count = 1 if lo <= 2 < hi else 0
+    for start, bits in segments(lo, hi, size):
+        count = count+int(np.unpackbits(bits).sum())
+    return count
+
+
+def miller_rabin(n, bases=_BASES):
+    """Miller-Rabin test, deterministic for n < 3.3*10**24."""
+    if n < 2:
+        return False
+    for p in bases:
+        if n % p == 0:
+            return n == p
+    d = n-1
+    s = 0
+    while d % 2 == 0:
+        d = d//2
+        s = s+1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n-1:
+            continue
+        for _ in range(s-1):
+            x = x*x % n
+            if x == n-1:
+                break
+        else:
+            return False
+    return True
+
+
+class PrimeTable:
+    """Sorted table of all primes below ``limit``, growing on demand."""
+
+    def __init__(self, limit=2**16, maxlimit=2**28):
+        self.limit = 0
+        self.maxlimit = maxlimit
+        self.primes = np.zeros(0, dtype=np.int64)
+        self.extend(limit)
+
+    def extend(self, limit):
+        """Extend the table to contain all primes below ``limit``."""
+        limit = min(limit, self.maxlimit)
+        if limit > self.limit:
+            new = list(iter_primes(self.limit, limit))
+            self.primes = np.concatenate([self.primes]+new)
+            self.limit = limit
+
+    def _ensure(self, n):
+        """Extend the table to contain n if n is not far beyond it."""
+        if self.limit <= n < GROWTH*self.limit:
+            self.extend(max(2*self.limit, n+1))
+
+    def is_prime(self, n):
+        self._ensure(n)
+        if n < self.limit:
+            i = np.searchsorted(self.primes, n)
+            return bool(i < len(self.primes) and self.primes[i] == n)
+        return miller_rabin(n)
+
+    def primes_between(self, lo, hi):
+        """Return an array of the primes in ``[lo, hi)``.
+
+        Primes beyond the table are found by a segmented sieve of the
+        interval without extending the table.
+        """
+        if hi <= lo:
+            return np.zeros(0, dtype=np.int64)
+        self._ensure(hi-1)
+        inside = self.primes[np.searchsorted(self.primes, lo):
+                             np.searchsorted(self.primes, hi)]
+        if hi <= self.limit:
+            return inside
+        return np.concatenate([inside]+list(
+            iter_primes(max(lo, self.limit), hi)))
+
+    def nth_prime(self, n):
+        """Return the n-th prime, counting from ``nth_prime(1) == 2``."""
+        if n < 1:
+            raise ValueError("n must be positive")
+        if n >= len(self.primes) and n >= 6:
+            self.extend(int(n*(math.log(n)+math.log(math.log(n))))+1)
+        if n <= len(self.primes):
+            return int(self.primes[n-1])
+        remaining = n-len(self.primes)
+        lo = self.limit
+        while True:
+            hi = lo+2*SEGMENT
+            for chunk in iter_primes(lo, hi):
+                if remaining <= len(chunk):
+                    return int(chunk[remaining-1])
+                remaining = remaining-len(chunk)
+            lo = hi
+
+
+_table = PrimeTable()
+
+
+def is_prime(n):
+    return _table.is_prime(n)
+
+
+def primes_between(lo, hi):
+    return _table.primes_between(lo, hi)
+
+
+def nth_prime(n):
+    return _table.nth_prime(n)
@@ -0,0 +1,157 @@
+"""Quadrature of vectorized integrands with fixed rules.
+
+``integrate.quad`` calls a Python function once for every abscissa, and
+integrating a family of integrands means one call of ``quad`` for every
+member of the family.  The rules in this module evaluate the integrand a
+single time on the array of all nodes, for all members of a family at once.
+
+The integrand is called as ``f(x, *args)``.  The parameters ``args`` and
+the limits ``a`` and ``b`` are broadcast against each other to a common
+shape ``S``, and ``x`` has the shape ``(n,)+S`` where ``n`` is the number of
+nodes.  The integrand has to return an array of the same shape, which for
+NumPy expressions in ``x`` and the parameters happens by itself.  Both
+rules return the integrals and error estimates as arrays of shape ``S``.
+
+``gauss_legendre`` applies a composite Gauss-Legendre rule and is the
+method of choice for smooth integrands.  ``tanh_sinh`` uses the double
+exponential substitution which copes with singularities of the integrand
+at the limits of integration.
+
+Running the module compares both rules with a loop over ``quad`` and with
+``special.j0`` for the Bessel function of the chapter on SciPy::
+
+    python -m eidprog.quadratur [NUMBER]
+"""
+
+import functools
+import sys
+import time
+from math import pi
+
+import numpy as np
+
+
+@functools.lru_cache()
+def legendre(n):
+    """Return nodes and weights of the n-point Gauss-Legendre rule."""
+    return np.polynomial.legendre.leggauss(n)
+
+
+@functools.lru_cache()
+def _tanh_sinh_nodes(level, tmax):
+    h = 2.0**-level
+    k = np.arange(int(tmax/h)+1)
+    s = k*h
+    u = pi/2*np.sinh(s)
+    # distance of the node from the upper limit for the interval [-1, 1]
+    d = 2/(np.exp(2*u)+1)
+    w = pi/2*np.cosh(s)*d*(2-d)
+    w[0] = w[0]/2
+    return k, d, w
+
+
+def _shapes(a, b, args):
+    a, b, *args = np.broadcast_arrays(np.asarray(a, dtype=float),
+                                      np.asarray(b, dtype=float), *args)
+    return a, b, args
+
+
+def _rule(f, a, b, args, t, w):
+    """Apply the rule with nodes t and weights w on [-1, 1] to [a, b]."""
+    mid = (a+b)/2
+    half = (b-a)/2
+    t = t.reshape(t.shape+(1,)*mid.ndim)
+    w = w.reshape(t.shape)
+    y = f(mid+half*t, *args)
+    return half*np.sum(w*y, axis=0)
+
+
+def gauss_legendre(f, a, b, args=(), n=32, panels=1):
+    """Integrate f from a to b with a composite Gauss-Legendre rule.
+
+    The interval is divided into ``panels`` panels with ``n`` nodes each.
+    The error is estimated by comparison with the rule of ``n//2`` nodes
+    per panel, which yields a conservative estimate.
+    """
+    a, b, args = _shapes(a, b, args)
+    edges = np.linspace(0, 1, panels+1)
+    result = np.zeros(a.shape)
+    error = np.zeros(a.shape)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        pa = a+lo*(b-a)
+        pb = a+hi*(b-a)
+        fine = _rule(f, pa, pb, args, *legendre(n))
+        coarse = _rule(f, pa, pb, args, *legendre(max(1, n//2)))
+        result = result+fine
+        error = error+np.abs(fine-coarse)
+    return result, error
+
+
+def tanh_sinh(f, a, b, args=(), level=6, tmax=3.5):
+    """Integrate f from a to b with the tanh-sinh rule.
+
+    The step size of the substituted variable is ``2**-level`` and its
+    range is limited to ``[-tmax, tmax]``.  The error is estimated by
+    comparison with the rule of twice the step size, which reuses every
+    second function value.  It does not include the part of the interval
+    cut off by ``tmax``, which dominates for integrands with strong
+    singularities at the limits; for these ``tmax`` has to be raised.
+    Nodes which coincide with a limit in floating
+    point are moved to the adjacent floating point number inside the
+    interval, so that the integrand is never evaluated at the limits.
+    """
+    a, b, args = _shapes(a, b, args)
+    k, d, w = _tanh_sinh_nodes(level, tmax)
+    half = (b-a)/2
+    shape = d.shape+(1,)*a.ndim
+    d = d.reshape(shape)
+    w = w.reshape(shape)
+    xplus = b-half*d
+    xminus = a+half*d
+    xplus = np.where(xplus == b, np.nextafter(b, a), xplus)
+    xminus = np.where(xminus == a, np.nextafter(a, b), xminus)
+    yplus = f(xplus, *args)
+    yminus = f(xminus, *args)
+    terms = w*(yplus+yminus)
+    h = 2.0**-level
+    fine = h*half*np.sum(terms, axis=0)
+    coarse = 2*h*half*np.sum(terms[k % 2 == 0], axis=0)
+    return fine, np.abs(fine-coarse)
+
+
+def benchmark(number=1000):
+    """Compare the rules for J0(z) = 1/pi int_0^pi cos(z cos x) dx."""
+    from math import cos
+    from scipy import integrate, special
+
+    def integrand(x, z):
+        return np.cos(z*np.cos(x))
+
+    z = np.linspace(0, 20, number)
+    exact = special.j0(z)
+    rows = []
+
+    start = time.perf_counter()
+    looped = np.array([integrate.quad(lambda x: cos(zi*cos(x)), 0, pi)[0]
+                       for zi in z])/pi
+    rows.append(("quad", time.perf_counter()-start, looped))
+
+    start = time.perf_counter()
+    result, _ = gauss_legendre(integrand, 0, pi, (z,), n=64)
+    rows.append(("gauss_legendre", time.perf_counter()-start, result/pi))
+
+    start = time.perf_counter()
+    result, _ = tanh_sinh(integrand, 0, pi, (z,), level=6)
+    rows.append(("tanh_sinh", time.perf_counter()-start, result/pi))
+
+    start = time.perf_counter()
+    special.j0(z)
+    rows.append(("special.j0", time.perf_counter()-start, exact))
+
+    for name, elapsed, values in rows:
+        print("{:15s} {:10.6f} s  max. error {:9.2e}".format(
+              name, elapsed, np.max(np.abs(values-exact))))
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""Random walks in two dimensions with fixed step length.
+
+Every walker draws its directions from an independent random stream derived
+from a common seed, so that a walk does not depend on how many walkers are
+simulated together or on the chunk size used to generate it.  Positions are
+obtained by cumulative sums over the steps.  Long walks are produced in
+chunks of at most ``chunksize`` array elements, so that the memory needed
+stays bounded independently of the number of steps.
+"""
+
+from math import pi
+
+import numpy as np
+
+
+def generators(nwalkers, seed=None):
+    """Return one independent random generator per walker."""
+    return [np.random.default_rng(s)
+            for s in np.random.SeedSequence(seed).spawn(nwalkers)]
+
+
+def chunks(nwalkers, nsteps, r=0.1, seed=None, chunksize=2**22):
+    """Yield consecutive pieces of the trajectories.
+
+    Each item is a pair ``(x, y)`` of arrays of shape ``(nwalkers, m)``
+    containing the positions after the next ``m`` steps.  The starting
+    point at the origin is not included.
+    """
+    rngs = generators(nwalkers, seed)
+    m = max(1, chunksize//nwalkers)
+    x0 = np.zeros((nwalkers, 1))
+    y0 = np.zeros((nwalkers, 1))
+    richtung = np.empty((nwalkers, m))
+    for start in range(0, nsteps, m):
+        n = min(m, nsteps-start)
+        for rng, row in zip(rngs, richtung):
+            rng.random(out=row[:n])
+        phi = 2*pi*richtung[:, :n]
+        x = np.cumsum(r*np.cos(phi), axis=1)
+        y = np.cumsum(r*np.sin(phi), axis=1)
+        x += x0
+        y += y0
+        x0 = x[:, -1:]
+        y0 = y[:, -1:]
+        yield x, y
+
+
+def trajectories(nwalkers, nsteps, r=0.1, seed=None, chunksize=2**22):
+    """Return the complete trajectories including the origin.
+
+    The result is a pair of arrays of shape ``(nwalkers, nsteps+1)``.
+    """
+    x = np.zeros((nwalkers, nsteps+1))
+    y = np.zeros((nwalkers, nsteps+1))
+    start = 1
+    for xc, yc in chunks(nwalkers, nsteps, r, seed, chunksize):
+        end = start+xc.shape[1]
+        x[:, start:end] = xc
+        y[:, start:end] = yc
+        start = end
+    return x, y
+
+
+def mean_square_displacement(nwalkers, nsteps, r=0.1, seed=None,
+                             chunksize=2**22):
+    """Return the mean square displacement averaged over all walkers.
+
+    The trajectories are never stored completely, only the resulting array
+    of length ``nsteps+1`` is kept.
+    """
+    msd = np.zeros(nsteps+1)
+    start = 1
+    for x, y in chunks(nwalkers, nsteps, r, seed, chunksize):
+        end = start+x.shape[1]
+        msd[start:end] = np.mean(x*x+y*y, axis=0)
+        start = end
+    return msd
@@ -0,0 +1,162 @@
+"""Conversion of the PDF figures to PNG in batched Ghostscript runs.
+
+Device and resolution of every figure are taken from ``images/figures.toml``.
+All PDF files sharing device and resolution are converted in a single
+Ghostscript run, and these runs are executed in parallel.  A PNG file is
+only produced anew if the PDF file, the device or the resolution changed
+since it was last written, as recorded in ``_build/raster.json``.  PDF
+files without an entry are not converted; ``eidprog.figures`` reports
+those written by figure scripts as failures.
+
+Usage, from the directory ``manuskript``::
+
+    python -m eidprog.raster [--force] [--jobs N] [--dry-run]
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tomllib
+from pathlib import Path
+
+MANUSKRIPT = Path(__file__).resolve().parent.parent
+IMAGES = MANUSKRIPT / "images"
+METADATA = IMAGES / "figures.toml"
+STAMPS = MANUSKRIPT / "_build" / "raster.json"
+STAGING = MANUSKRIPT / "_build" / "raster"
+GS = "gs"
+OPTIONS = ["-dSAFER", "-dNOPAUSE", "-dQUIET", "-dBATCH",
+           "-dTextAlphaBits=4", "-dGraphicsAlphaBits=4"]
+
+
+def load_metadata():
+    with open(METADATA, "rb") as f:
+        return tomllib.load(f)
+
+
+def unlisted(names, metadata=None):
+    """Return the PDF files among names which have no entry in the metadata."""
+    if metadata is None:
+        metadata = load_metadata()
+    return [name for name in names
+            if name.endswith(".pdf") and name not in metadata]
+
+
+def load_stamps():
+    try:
+        return json.loads(STAMPS.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stamps(stamps):
+    STAMPS.parent.mkdir(parents=True, exist_ok=True)
+    STAMPS.write_text(json.dumps(stamps, indent=1, sort_keys=True)+"\n")
+
+
+def digest(pdf, device, resolution):
+    h = hashlib.sha256(pdf.read_bytes())
+    h.update("{} {}".format(device, resolution).encode())
+    return h.hexdigest()
+
+
+def stale(metadata, stamps, force=False):
+    """Return a dictionary mapping ``(device, resolution)`` to lists of
+    pairs ``(name, digest)`` of the PDF files which need a conversion.
+
+    PDF files without a recorded digest whose PNG file exists, as after a
+    fresh checkout, are taken to be converted, and their digest is entered
+    into ``stamps``.
+    """
+    groups = {}
+    for name, meta in sorted(metadata.items()):
+        pdf = IMAGES / name
+        if not pdf.exists():
+            continue
+        key = meta["device"], meta["resolution"]
+        d = digest(pdf, *key)
+        png = pdf.with_suffix(".png")
+        if not force and name not in stamps and png.exists():
+            stamps[name] = d
+        if force or stamps.get(name) != d or not png.exists():
+            groups.setdefault(key, []).append((name, d))
+    return groups
+
+
+def rasterize(device, resolution, pdfs):
+    """Convert single-page PDF files in one Ghostscript run.
+
+    The PNG files are written next to the PDF files, replacing the old ones
+    only after all pages were converted.  Returns the standard error output
+    of Ghostscript if the conversion failed, otherwise None.
+    """
+    STAGING.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=STAGING) as tmpdir:
+        cmd = [GS, *OPTIONS, "-r%d" % resolution, "-sDEVICE=%s" % device,
+               "-sOutputFile=%s" % os.path.join(tmpdir, "%d.png")]
+        try:
+            result = subprocess.run(cmd+[str(p) for p in pdfs],
+                                    capture_output=True, text=True)
+        except OSError as e:
+            return str(e)+"\n"
+        if result.returncode:
+            return result.stderr
+        pages = sorted(Path(tmpdir).glob("*.png"), key=lambda p: int(p.stem))
+        if len(pages) != len(pdfs):
+            return "expected {} pages, got {}\n".format(len(pdfs), len(pages))
+        for page, pdf in zip(pages, pdfs):
+            os.replace(page, pdf.with_suffix(".png"))
+    return None
+
+
+def build(force=False, jobs=None, dry_run=False):
+    """Convert all stale PDF files and return the number of failures."""
+    stamps = load_stamps()
+    recorded = dict(stamps)
+    groups = stale(load_metadata(), stamps, force)
+    if dry_run:
+        for names in groups.values():
+            for name, _ in names:
+                print(name)
+        return 0
+    failures = 0
+    with concurrent.futures.ThreadPoolExecutor(jobs or os.cpu_count()) as ex:
+        futures = {ex.submit(rasterize, device, resolution,
+                             [IMAGES / name for name, _ in names]): names
+                   for (device, resolution), names in groups.items()}
+        for future in concurrent.futures.as_completed(futures):
+            names = futures[future]
+            error = future.result()
+            for name, d in names:
+                if error is None:
+                    print("rasterized", name)
+                    stamps[name] = d
+                else:
+                    failures = failures+1
+                    print("failed", name, file=sys.stderr)
+            if error is not None:
+                sys.stderr.write(error)
+    if stamps != recorded:
+        save_stamps(stamps)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="convert all figures")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of Ghostscript runs in parallel")
+    parser.add_argument("--dry-run", "-n", action="store_true",
+                        help="only list the stale figures")
+    args = parser.parse_args(argv)
+    return 1 if build(args.force, args.jobs, args.dry_run) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
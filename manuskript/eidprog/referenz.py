@@ -0,0 +1,124 @@
+"""Reference versions of algorithms presented in the manuscript.
+
+The functions and classes are taken over from the chapters as they are
+printed, apart from the conversion of the output to Python 3, so that they
+can be imported by ``eidprog.benchmark`` and compared with the optimized
+versions in the other modules of this package.  They are not meant to be
+used otherwise; in particular ``Bruch`` loops forever for a vanishing
+numerator.
+"""
+
+from math import cos, exp, pi, sin, sqrt
+
+import numpy as np
+from numpy.random import rand
+from scipy import integrate
+
+from .fakultaet import fakultaet_rekursiv  # noqa: F401
+
+
+def is_prime(n):
+    for divisor in range(2, n):
+        if n % divisor == 0:
+            return False
+    return True
+
+
+def fakultaet(n):
+    produkt = 1
+    for m in range(n):
+        produkt = produkt*(m+1)
+    return produkt
+
+
+def ableitung(f, x, h=1e-7):
+    df = (f(x+h)-f(x-h))/(2*h)
+    return df
+
+
+class Bruch:
+
+    def __init__(self, zaehler, nenner=1):
+        self.zaehler = zaehler
+        self.nenner = nenner
+        self.__reduce()
+
+    def __reduce(self):
+        a = self.zaehler
+        b = self.nenner
+        while a!=b and a!=1 and b!=1:
+            a, b = min(a, b), abs(a-b)
+        if a==b:
+            self.zaehler = self.zaehler//a
+            self.nenner = self.nenner//a
+
+    def __str__(self):
+        if self.nenner!=1:
+            return "{}/{}".format(self.zaehler, self.nenner)
+        else:
+            return str(self.zaehler)
+
+    def __add__(self, other):
+        return Bruch(self.zaehler*other.nenner+self.nenner*other.zaehler,
+                     self.nenner*other.nenner)
+
+    def __mul__(self, other):
+        return Bruch(self.zaehler*other.zaehler,
+                     self.nenner*other.nenner)
+
+    def __float__(self):
+        return float(self.zaehler)/self.nenner
+
+    def __lt__(self, other):
+        return self.zaehler*other.nenner < other.zaehler*self.nenner
+
+    def __eq__(self, other):
+        return self.zaehler==other.zaehler and self.nenner==other.nenner
+
+
+def get_hex_string(hexcode):
+    if hexcode <= 0x7f:
+        return "%02X" % hexcode
+    if 0x80 <= hexcode <= 0x7ff:
+        return "%04X" % (0xc080+((hexcode >> 6) << 8)+(hexcode & 0x3f))
+    if 0x800 <= hexcode <= 0xffff:
+        return "%06X" % (0xe08080+((hexcode >> 12) << 16) +
+                         ((hexcode & 0xfc0) << 2) +
+                         (hexcode & 0x3f)
+                         )
+    else:
+        return 0
+
+
+def randomwalk(npts, r=0.1):
+    """Return one trajectory as in the original randomwalk.py."""
+    richtung = 2*pi*rand(npts)
+    dx = r*np.cos(richtung)
+    dy = r*np.sin(richtung)
+
+    x = [0]
+    y = [0]
+    for n in range(npts):
+        x.append(x[-1]+dx[n])
+        y.append(y[-1]+dy[n])
+    return x, y
+
+
+def oszillator(gamma, pts):
+    """Solve the damped oscillator of the chapter on SciPy."""
+    def ableitung(y, t, gamma):
+        x, p = y
+        return np.array([p, -x-gamma*p])
+
+    anfangsbedingungen = np.array([0, 1])
+    omega = sqrt(1-0.25*gamma**2)
+    ergebnis = integrate.odeint(ableitung, anfangsbedingungen, pts, (gamma,))
+    ort = ergebnis[:, 0]
+    exakt = [exp(-0.5*gamma*t)*sin(omega*t)/omega for t in pts]
+    return ort, exakt
+
+
+def bessel(z):
+    """Return J0(z) by integration as in the chapter on SciPy."""
+    resultat, fehler = integrate.quad(lambda x: cos(z*cos(x)), 0, pi)
+    return resultat/pi
@@ -0,0 +1,144 @@
+"""Summation of slowly converging series.
+
+The chapter on control structures approximates the series of the inverse
+squares, whose value is pi**2/6, by adding its first 100000 terms in a
+``for`` loop.  This is slow, and the error of the result is dominated by
+the neglected terms.
+
+``summe`` evaluates the terms for whole chunks of indices with a
+vectorized function and adds them with NumPy's pairwise summation.  The
+partial sums of the chunks are collected in an ``Akkumulator``, which
+keeps track of the rounding error of every addition in a second variable
+as proposed by Neumaier.  For series of terms of equal sign the result is
+thus accurate to a few units in the last place even for 10**9 terms.
+``Akkumulator.extend`` accepts arbitrary iterables, like generators, which
+are consumed in chunks.
+
+Much fewer terms are needed if the neglected rest of the series is
+accounted for.  ``euler_maclaurin`` estimates the rest from the integral
+of the terms and their odd derivatives at the first neglected index, and
+``potenzrest`` provides these for terms ``k**-s``.  ``richardson``
+extrapolates the partial sums for a sequence of doubled numbers of terms,
+assuming that their errors are expanded in powers of ``1/n``.  For the
+example of the chapter::
+
+    >>> from math import pi, sqrt
+    >>> s = summe(lambda k: 1/k**2, 1, 10)+potenzrest(2, 11)
+    >>> abs(sqrt(6*s)-pi) < 1e-12
+    True
+"""
+
+import itertools
+from math import factorial
+
+import numpy as np
+
+#: Bernoulli numbers B_2, B_4, ... as floats
+BERNOULLI = (1/6, -1/30, 1/42, -1/30, 5/66, -691/2730, 7/6, -3617/510)
+
+
+class Akkumulator:
+    """Compensated sum of floats and arrays of floats."""
+
+    def __init__(self):
+        self.summe = 0.0
+        self.korrektur = 0.0
+
+    def add(self, x):
+        """Add a number or the sum of an array of numbers."""
+        x = float(np.sum(x))
+        t = self.summe+x
+        if abs(self.summe) >= abs(x):
+            self.korrektur = self.korrektur+((self.summe-t)+x)
+        else:
+            self.korrektur = self.korrektur+((x-t)+self.summe)
+        self.summe = t
+
+    def extend(self, terms, chunksize=2**16):
+        """Add all terms of an iterable, taking chunksize terms at a time."""
+        terms = iter(terms)
+        while True:
+            chunk = np.fromiter(itertools.islice(terms, chunksize),
+                                dtype=float)
+            if not len(chunk):
+                break
+            self.add(chunk)
+
+    def merge(self, other):
+        """Add the value of another accumulator."""
+        self.add(other.summe)
+        self.korrektur = self.korrektur+other.korrektur
+
+    @property
+    def wert(self):
+        return self.summe+self.korrektur
+
+
+def summe(term, start, stop, chunksize=2**20, akkumulator=None):
+    """Return the sum of term(k) for start <= k <= stop.
+
+    ``term`` is called with arrays of at most ``chunksize`` float indices.
+    The chunks are added in reverse order, beginning with the largest
+    indices, since the terms of a converging series usually decrease.  If
+    an accumulator is given, the sum is added to it.
+    """
+    acc = Akkumulator() if akkumulator is None else akkumulator
+    hi = stop+1
+    while hi > start:
+        lo = max(start, hi-chunksize)
+        acc.add(term(np.arange(lo, hi, dtype=float)))
+        hi = lo
+    return acc.wert
+
+
+def euler_maclaurin(f, n, integral, ableitungen=()):
+    """Return the rest f(n)+f(n+1)+... of a series.
+
+    ``integral`` is the integral of f from n to infinity and ``ableitungen``
+    are the derivatives f'(n), f'''(n), ... of odd order.  The more
+    derivatives are given and the larger n, the smaller is the error, as
+    long as the derivatives decrease.
+    """
+    rest = integral+f(n)/2
+    for j, ableitung in enumerate(ableitungen, start=1):
+        rest = rest-BERNOULLI[j-1]/factorial(2*j)*ableitung
+    return rest
+
+
+def potenzrest(s, n, ordnung=4):
+    """Return the rest of the series of k**-s beginning with k=n > 0.
+
+    ``ordnung`` is the number of derivatives used in ``euler_maclaurin``.
+    """
+    ableitungen = []
+    for j in range(1, ordnung+1):
+        m = 2*j-1
+        koeffizient = 1.0
+        for i in range(m):
+            koeffizient = koeffizient*(s+i)
+        ableitungen.append(-koeffizient*n**(-s-m))
+    return euler_maclaurin(lambda k: k**-s, n, n**(1-s)/(s-1), ableitungen)
+
+
+def richardson(term, start=1, n=16, stufen=6, exponent=1, chunksize=2**20):
+    """Extrapolate the partial sums of a series to infinitely many terms.
+
+    The partial sums are computed for ``n``, ``2*n``, ... ``2**stufen*n``
+    terms, beginning with the index ``start``.  Their errors are assumed to
+    be expanded in the powers ``1/n**exponent``, ``1/n**(exponent+1)``, ...
+    Returns the extrapolated value and an error estimate.
+    """
+    acc = Akkumulator()
+    stop = start-1
+    zeile = []
+    for stufe in range(stufen+1):
+        anzahl = n*2**stufe
+        summe(term, stop+1, start+anzahl-1, chunksize, acc)
+        stop = start+anzahl-1
+        neu = [acc.wert]
+        for j, alt in enumerate(zeile):
+            faktor = 2.0**(exponent+j)-1
+            neu.append(neu[j]+(neu[j]-alt)/faktor)
+        fehler = abs(neu[-1]-zeile[-1]) if zeile else abs(neu[-1])
+        zeile = neu
+    return zeile[-1], fehler
@@ -0,0 +1,288 @@
+"""Binary result files for parameter sweeps.
+
+The chapter on input and output writes the results for every value of a
+parameter line by line into a file of its own, ``resultate_00012.dat``.
+For large sweeps the formatting of millions of lines and the handling of
+thousands of files dominate the run time.  A ``ResultStore`` instead
+appends the results of all parameter values as binary arrays to a single
+file::
+
+    with ResultStore("resultate.bin", "w") as store:
+        for parameter in range(1000):
+            n = np.arange(parameter)
+            store.write(parameter, n*n)
+
+Results which are produced piecewise are appended through a writer, which
+collects small pieces into chunks of ``chunksize`` bytes before writing::
+
+    with store.writer(parameter, dtype=np.int64) as w:
+        for n in range(parameter):
+            w.write(n*n)
+
+The file starts with a magic string and contains the arrays, each aligned
+to 64 bytes, followed by an index in JSON format which maps every parameter
+to data type, shape and offset of its array.  The 16 bytes following the
+index hold its offset and a second magic string.  The index is written
+when the store is closed.  In mode ``"a"`` the data are appended behind the
+old index, which remains valid until the new one is written, so that a
+crash loses only the data appended since opening.  A result whose writer
+is left by an exception is not entered into the index.  Parameters may be
+any values which can be represented in JSON, like numbers, strings or
+lists.
+
+Reading returns memory-mapped arrays, so that only the data actually used
+is read from disk.  ``export_text`` writes the files of the original format
+or CSV files for programs which cannot read the binary format.
+"""
+
+import json
+import os
+
+import numpy as np
+
+MAGIC = b"EIDRES01"
+INDEXMAGIC = b"EIDRIDX1"
+ALIGNMENT = 64
+
+
+def _key(parameter):
+    return json.dumps(parameter, sort_keys=True)
+
+
+def _index_at(f, footer):
+    """Return the entries of an index ending at footer or None."""
+    if footer < len(MAGIC)+8:
+        return None
+    f.seek(footer-8)
+    offset = int.from_bytes(f.read(8), "little")
+    if not len(MAGIC) <= offset <= footer-8:
+        return None
+    f.seek(offset)
+    try:
+        entries = json.loads(f.read(footer-8-offset).decode("utf-8"))
+    except ValueError:
+        return None
+    return entries if isinstance(entries, list) else None
+
+
+def _read_index(f, blocksize=2**20):
+    """Return the entries of the last complete index of a file or None.
+
+    Normally the index is at the end of the file.  After a crash while
+    appending, the data written since are skipped by searching backwards
+    for the magic string of the index.
+    """
+    end = f.seek(0, os.SEEK_END)
+    while end > len(MAGIC):
+        start = max(len(MAGIC), end-blocksize)
+        f.seek(start)
+        data = f.read(end-start)
+        position = data.rfind(INDEXMAGIC)
+        while position >= 0:
+            entries = _index_at(f, start+position)
+            if entries is not None:
+                return entries
+            position = data.rfind(INDEXMAGIC, 0, position)
+        if start == len(MAGIC):
+            break
+        end = start+len(INDEXMAGIC)-1
+    return None
+
+
+class ResultStore:
+    """Single file container of arrays indexed by parameter values.
+
+    ``mode`` is ``"r"`` for reading, ``"w"`` for creating a new file and
+    ``"a"`` for appending to an existing file.
+    """
+
+    def __init__(self, filename, mode="r", chunksize=2**23):
+        if mode not in ("r", "w", "a"):
+            raise ValueError("mode must be 'r', 'w' or 'a'")
+        self.filename = os.fspath(filename)
+        self.mode = mode
+        self.chunksize = chunksize
+        self.index = {}
+        self._open_writer = None
+        self._unchanged = False
+        if mode == "w":
+            self._file = open(self.filename, "w+b")
+            self._file.write(MAGIC)
+            return
+        self._file = open(self.filename, "rb" if mode == "r" else "r+b")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError("{} is not a result file".format(self.filename))
+        entries = _read_index(self._file)
+        if entries is None:
+            self._file.close()
+            raise ValueError("index of {} is missing".format(self.filename))
+        self.index = {_key(e["parameter"]): e for e in entries}
+        self._unchanged = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self._open_writer is not None:
+            self._open_writer.discard()
+        self.close()
+
+    def close(self):
+        """Write the index if necessary and close the file."""
+        if self._file.closed:
+            return
+        if self._open_writer is not None:
+            self._open_writer.close()
+        if self.mode != "r" and not self._unchanged:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            entries = list(self.index.values())
+            self._file.write(json.dumps(entries).encode("utf-8"))
+            self._file.write(offset.to_bytes(8, "little"))
+            self._file.write(INDEXMAGIC)
+        self._file.close()
+
+    def _align(self):
+        self._file.seek(0, os.SEEK_END)
+        position = self._file.tell()
+        padding = -position % ALIGNMENT
+        self._file.write(bytes(padding))
+        return position+padding
+
+    def writer(self, parameter, dtype, shape=()):
+        """Return a writer appending the result for ``parameter``.
+
+        The result is a one-dimensional sequence of items of the given
+        ``shape``.  Only one writer may be open at a time.
+        """
+        if self.mode == "r":
+            raise ValueError("store is opened for reading")
+        if self._open_writer is not None:
+            raise ValueError("another writer is still open")
+        if _key(parameter) in self.index:
+            raise KeyError("result for {!r} exists already".format(parameter))
+        self._unchanged = False
+        self._open_writer = Writer(self, parameter, np.dtype(dtype),
+                                   tuple(shape), self._align())
+        return self._open_writer
+
+    def write(self, parameter, values):
+        """Store the array ``values`` as result for ``parameter``."""
+        values = np.asarray(values)
+        with self.writer(parameter, values.dtype, values.shape[1:]) as w:
+            w.write(values)
+
+    def _finish(self, writer):
+        self.index[_key(writer.parameter)] = {
+            "parameter": writer.parameter,
+            "dtype": writer.dtype.str,
+            "shape": [writer.length]+list(writer.shape),
+            "offset": writer.offset}
+        self._open_writer = None
+
+    def parameters(self):
+        """Return the parameters in the order their results were written."""
+        return [e["parameter"] for e in self.index.values()]
+
+    def __contains__(self, parameter):
+        return _key(parameter) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, parameter):
+        """Return the result for ``parameter`` as memory-mapped array."""
+        entry = self.index[_key(parameter)]
+        shape = tuple(entry["shape"])
+        if 0 in shape:
+            return np.empty(shape, dtype=entry["dtype"])
+        self._file.flush()
+        return np.memmap(self.filename, dtype=entry["dtype"], mode="r",
+                         offset=entry["offset"], shape=shape)
+
+    def export_text(self, pattern="resultate_{:05}.dat", fmt=None,
+                    delimiter=" ", parameters=None):
+        """Write the results into text files, one per parameter.
+
+        The file name is obtained by formatting ``pattern`` with the
+        parameter.  By default the results of all parameters are written,
+        integers with the format ``%10d`` and floats with ``%.17g``.  With
+        the defaults the files of the chapter on input and output are
+        reproduced; ``delimiter=","`` together with a pattern ending in
+        ``.csv`` yields CSV files.
+        """
+        if parameters is None:
+            parameters = self.parameters()
+        for parameter in parameters:
+            values = self[parameter]
+            if values.ndim > 2:
+                values = values.reshape(len(values), -1)
+            if fmt is None:
+                f = "%10d" if values.dtype.kind in "iu" else "%.17g"
+            else:
+                f = fmt
+            np.savetxt(pattern.format(parameter), values, fmt=f,
+                       delimiter=delimiter)
+
+
+class Writer:
+    """Append the result of one parameter in pieces.
+
+    Writers are obtained from ``ResultStore.writer``.
+    """
+
+    def __init__(self, store, parameter, dtype, shape, offset):
+        self.store = store
+        self.parameter = parameter
+        self.dtype = dtype
+        self.shape = shape
+        self.offset = offset
+        self.length = 0
+        self._buffer = []
+        self._buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(self, values):
+        """Append one item or an array of items."""
+        values = np.asarray(values, dtype=self.dtype)
+        if values.shape == self.shape:
+            values = values[np.newaxis]
+        if values.shape[1:] != self.shape:
+            raise ValueError("items must have shape {}".format(self.shape))
+        self.length = self.length+len(values)
+        if values.nbytes >= self.store.chunksize:
+            self._flush()
+            self.store._file.write(np.ascontiguousarray(values).data)
+            return
+        self._buffer.append(values.tobytes())
+        self._buffered = self._buffered+values.nbytes
+        if self._buffered >= self.store.chunksize:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self.store._file.write(b"".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Write the remaining data and enter the result into the index."""
+        if self.store._open_writer is self:
+            self._flush()
+            self.store._finish(self)
+
+    def discard(self):
+        """Drop the result; the data already written remain unused."""
+        if self.store._open_writer is self:
+            self._buffer = []
+            self._buffered = 0
+            self.store._open_writer = None
@@ -0,0 +1,147 @@
+"""Sphinx extension measuring where the build time is spent.
+
+The extension records the time needed to read and to write every
+document, and the duration of the build phases reading, resolving, writing
+and finishing.  Only Sphinx events and ``time.perf_counter`` are used.
+Reading times are stored in the build environment, so that they are also
+collected when documents are read in parallel worker processes.
+
+Sphinx announces every document by the event ``doctree-resolved`` just
+before writing it, so the time of a document is taken from this event to
+the next one.  The time after the last document was resolved is reported
+as the phase finishing; it includes writing this document as well as
+copying images and writing indices.  When documents are written in
+parallel worker processes, the times only cover resolving them.  At the
+end of the build the slowest items are logged and all timings are written
+to the file ``profile-<builder>.json`` next to the doctree directory.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT = 5
+
+
+class Profile:
+
+    def __init__(self):
+        self.phases = {}
+        self.marks = {}
+        self.written = {}
+        self.reading = {}
+        self.docnames = []
+        self.current = None
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter()
+
+    def phase(self, name, start, end):
+        if start in self.marks and end in self.marks:
+            self.phases[name] = self.marks[end]-self.marks[start]
+
+
+def _profile(app):
+    return app.eidprog_profile
+
+
+def builder_inited(app):
+    app.eidprog_profile = profile = Profile()
+    profile.mark("start")
+
+
+def env_before_read_docs(app, env, docnames):
+    profile = _profile(app)
+    profile.mark("read")
+    profile.docnames = list(docnames)
+    if not hasattr(env, "eidprog_reading"):
+        env.eidprog_reading = {}
+
+
+def source_read(app, docname, source):
+    app.env.eidprog_readstart = time.perf_counter()
+
+
+def doctree_read(app, doctree):
+    env = app.env
+    start = getattr(env, "eidprog_readstart", None)
+    if start is not None:
+        if not hasattr(env, "eidprog_reading"):
+            env.eidprog_reading = {}
+        env.eidprog_reading[env.docname] = time.perf_counter()-start
+
+
+def env_merge_info(app, env, docnames, other):
+    env.eidprog_reading.update(getattr(other, "eidprog_reading", {}))
+
+
+def env_purge_doc(app, env, docname):
+    getattr(env, "eidprog_reading", {}).pop(docname, None)
+
+
+def env_updated(app, env):
+    profile = _profile(app)
+    profile.mark("resolve")
+    reading = getattr(env, "eidprog_reading", {})
+    profile.reading = {d: reading[d] for d in profile.docnames if d in reading}
+    profile.phase("reading", "read", "resolve")
+
+
+def write_started(app, builder):
+    profile = _profile(app)
+    profile.mark("write")
+    profile.phase("resolving", "resolve", "write")
+
+
+def doctree_resolved(app, doctree, docname):
+    profile = _profile(app)
+    now = time.perf_counter()
+    if profile.current is not None:
+        previous, start = profile.current
+        profile.written[previous] = now-start
+    profile.current = docname, now
+    profile.marks["finish"] = now
+
+
+def _slowest(timings):
+    return sorted(timings.items(), key=lambda item: -item[1])[:REPORT]
+
+
+def build_finished(app, exception):
+    if exception is not None:
+        return
+    profile = _profile(app)
+    profile.mark("end")
+    profile.phase("writing", "write", "finish")
+    profile.phase("finishing", "finish", "end")
+    profile.phase("total", "start", "end")
+    data = {"builder": app.builder.name,
+            "phases": profile.phases,
+            "read": profile.reading,
+            "write": profile.written}
+    target = Path(app.doctreedir).parent / ("profile-%s.json"
+                                            % app.builder.name)
+    target.write_text(json.dumps(data, indent=1, sort_keys=True)+"\n")
+    for name, seconds in profile.phases.items():
+        logger.info("profile: %s %.2f s", name, seconds)
+    for kind in ("read", "write"):
+        for name, seconds in _slowest(data[kind]):
+            logger.info("profile: %s %s %.3f s", kind, name, seconds)
+
+
+def setup(app):
+    app.connect("builder-inited", builder_inited)
+    app.connect("env-before-read-docs", env_before_read_docs)
+    app.connect("source-read", source_read)
+    app.connect("doctree-read", doctree_read)
+    app.connect("env-merge-info", env_merge_info)
+    app.connect("env-purge-doc", env_purge_doc)
+    app.connect("env-updated", env_updated)
+    app.connect("write-started", write_started)
+    app.connect("doctree-resolved", doctree_resolved)
+    app.connect("build-finished", build_finished)
+    return {"parallel_read_safe": True, "parallel_write_safe": True}
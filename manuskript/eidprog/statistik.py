@@ -0,0 +1,150 @@
+"""Statistics of data streams in a single pass.
+
+The functions ``mittelwert1`` and ``mittelwert2`` of the chapter on
+sequences need all values at once as tuple and only determine the mean.  A
+``Statistik`` instead is fed with the values piecewise, as single numbers,
+as arrays, which may also be memory-mapped files, or as iterables, and
+needs memory independent of the number of values.  It provides the number
+of values, mean and variance, which are updated for every chunk of values
+by the method of Welford in the form given by Chan, Golub and LeVeque, as
+well as minimum and maximum::
+
+    stat = Statistik()
+    for chunk in chunks:
+        stat.add(chunk)
+    print(stat.anzahl, stat.mittelwert, stat.varianz(), stat.maximum)
+
+With ``reservoir=k`` a uniform random sample of k values is kept, from
+which quantiles are estimated; they are exact as long as not more than k
+values were added.  Accumulators of parts of the data, for example from
+different files or worker processes, are combined by ``merge``, provided
+they keep reservoirs of the same size.
+"""
+
+import itertools
+
+import numpy as np
+
+
+class Statistik:
+    """Accumulator for count, mean, variance, extrema and quantiles."""
+
+    def __init__(self, reservoir=0, seed=None, chunksize=2**20):
+        self.anzahl = 0
+        self.mittelwert = 0.0
+        self._m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.chunksize = chunksize
+        self._k = reservoir
+        self._stichprobe = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, x):
+        """Add a number or the elements of an array."""
+        x = np.asarray(x, dtype=float).ravel()
+        for start in range(0, len(x), self.chunksize):
+            self._add_chunk(np.asarray(x[start:start+self.chunksize]))
+
+    def extend(self, werte):
+        """Add all numbers of an iterable, taking chunks of them."""
+        werte = iter(werte)
+        while True:
+            chunk = np.fromiter(itertools.islice(werte, self.chunksize),
+                                dtype=float)
+            if not len(chunk):
+                break
+            self._add_chunk(chunk)
+
+    def _add_chunk(self, x):
+        n = len(x)
+        if not n:
+            return
+        mittelwert = x.mean()
+        m2 = np.sum((x-mittelwert)**2)
+        self._combine(n, mittelwert, m2)
+        self.minimum = min(self.minimum, x.min())
+        self.maximum = max(self.maximum, x.max())
+        if self._k:
+            self._sample(x)
+
+    def _combine(self, n, mittelwert, m2):
+        gesamt = self.anzahl+n
+        delta = mittelwert-self.mittelwert
+        self.mittelwert = self.mittelwert+delta*n/gesamt
+        self._m2 = self._m2+m2+delta**2*self.anzahl*n/gesamt
+        self.anzahl = gesamt
+
+    def _sample(self, x):
+        """Update the reservoir after the values x were counted."""
+        k = self._k
+        vorher = self.anzahl-len(x)
+        frei = max(0, k-len(self._stichprobe))
+        self._stichprobe = np.concatenate((self._stichprobe, x[:frei]))
+        x = x[frei:]
+        if not len(x):
+            return
+        # the value with index t (counted from 1) replaces a random element
+        # of the sample with probability k/t
+        t = np.arange(vorher+frei+1, self.anzahl+1)
+        j = (self._rng.random(len(x))*t).astype(np.int64)
+        auswahl = np.nonzero(j < k)[0]
+        # of several values for the same position only the last one counts
+        position, letzte = np.unique(j[auswahl][::-1], return_index=True)
+        self._stichprobe[position] = x[auswahl[::-1][letzte]]
+
+    def merge(self, other):
+        """Add the values accumulated by another instance.
+
+        Both instances have to keep reservoirs of the same size, since
+        their samples could not be combined into a uniform sample
+        otherwise.
+        """
+        if self._k != other._k:
+            raise ValueError("reservoirs of different sizes {} and {}"
+                             .format(self._k, other._k))
+        if not other.anzahl:
+            return
+        n = self.anzahl
+        self._combine(other.anzahl, other.mittelwert, other._m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        if self._k:
+            a = self._stichprobe
+            b = other._stichprobe
+            if len(a)+len(b) <= self._k:
+                self._stichprobe = np.concatenate((a, b))
+                return
+            ka = self._rng.binomial(self._k, n/self.anzahl)
+            ka = min(max(ka, self._k-len(b)), len(a))
+            self._stichprobe = np.concatenate((
+                self._rng.choice(a, ka, replace=False),
+                self._rng.choice(b, self._k-ka, replace=False)))
+
+    def varianz(self, ddof=0):
+        """Return the variance, with ddof=1 the sample variance.
+
+        The result is nan if there are not more than ddof values.
+        """
+        if self.anzahl <= ddof:
+            return np.nan
+        return self._m2/(self.anzahl-ddof)
+
+    def standardabweichung(self, ddof=0):
+        return np.sqrt(self.varianz(ddof))
+
+    def quantil(self, q):
+        """Return the q-quantile(s) estimated from the reservoir."""
+        if not len(self._stichprobe):
+            raise ValueError("no reservoir of values available")
+        return np.quantile(self._stichprobe, q)
+
+
+def mittelwert(werte):
+    """Return the mean of the numbers of an iterable or array."""
+    stat = Statistik()
+    if isinstance(werte, np.ndarray):
+        stat.add(werte)
+    else:
+        stat.extend(werte)
+    return stat.mittelwert
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from eidprog import ableitung
+
+
+class AbleitungTest(unittest.TestCase):
+
+    x = np.linspace(-20, 20, 1001)
+
+    def test_default_steps(self):
+        d = ableitung.ableitung(np.sin, self.x)
+        np.testing.assert_allclose(d, np.cos(self.x), atol=1e-11)
+        d = ableitung.ableitung(np.sin, self.x, richardson=False)
+        np.testing.assert_allclose(d, np.cos(self.x), atol=1e-9)
+        d = ableitung.ableitung(np.exp, [-3.0, 0.0, 3.0])
+        np.testing.assert_allclose(d, np.exp([-3.0, 0.0, 3.0]), rtol=1e-11)
+
+    def test_orders(self):
+        # halving h divides the error by 4 for central differences and
+        # by 16 after Richardson extrapolation
+        for richardson, ratio in ((False, 4), (True, 16)):
+            fehler = [abs(float(ableitung.ableitung(np.exp, 1.0, h,
+                                                    richardson))-np.e)
+                      for h in (0.1, 0.05)]
+            self.assertAlmostEqual(fehler[0]/fehler[1], ratio, delta=0.1)
+
+    def test_schrittweite(self):
+        x = np.array([0.0, 1e-8, 1.0, 1e8])
+        h = ableitung.schrittweite(x)
+        np.testing.assert_array_equal((x+h)-x, h)
+        self.assertTrue(np.all(h > 0))
+
+
+class JacobiTest(unittest.TestCase):
+
+    @staticmethod
+    def polar(p):
+        r, phi = p[..., 0], p[..., 1]
+        return np.stack((r*np.cos(phi), r*np.sin(phi)), axis=-1)
+
+    def test_reference(self):
+        rng = np.random.default_rng(6)
+        p = rng.uniform(0.5, 2, (10, 2))
+        r, phi = p[:, 0], p[:, 1]
+        expected = np.stack((np.stack((np.cos(phi), -r*np.sin(phi)), -1),
+                             np.stack((np.sin(phi), r*np.cos(phi)), -1)),
+                            axis=-2)
+        np.testing.assert_allclose(ableitung.jacobi(self.polar, p), expected,
+                                   atol=1e-10)
+
+    def test_gradient(self):
+        p = np.array([[1.0, 2.0, 3.0], [-1.0, 0.5, 0.0]])
+        g = ableitung.gradient(lambda y: np.sum(y**2, axis=-1), p)
+        np.testing.assert_allclose(g, 2*p, atol=1e-10)
+
+
+if __name__ == "__main__":
+    unittest.main()
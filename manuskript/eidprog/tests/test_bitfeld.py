@@ -0,0 +1,27 @@
+import unittest
+
+from eidprog.bitfeld import BitLayout
+
+
+class BitLayoutTest(unittest.TestCase):
+
+    def test_bits(self):
+        layout = BitLayout([(1, None)]*16)
+        for value in (0, 1, 0xE9, 0xFFFF, 0x8001):
+            bits = layout.bits(value)
+            self.assertEqual(len(bits), 16)
+            self.assertEqual(int("".join(map(str, bits)), 2), value)
+
+    def test_geometry(self):
+        layout = BitLayout([(3, 0.8), (5, None), (8, None)], size=0.4,
+                           group=8, gap=0.1)
+        self.assertEqual(layout.nbits, 16)
+        self.assertEqual([layout.x(n) for n in (0, 7, 8, 15)],
+                         [0, 7*0.4, 8*0.4+0.1, 15*0.4+0.1])
+        self.assertAlmostEqual(layout.width, 16*0.4+0.1)
+        self.assertEqual(len(layout._fills), 1)
+        self.assertEqual(len(layout._strokes), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
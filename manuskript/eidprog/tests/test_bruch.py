@@ -0,0 +1,111 @@
+import itertools
+import operator
+import unittest
+from fractions import Fraction
+
+import numpy as np
+
+from eidprog.bruch import Bruch, BruchArray
+
+OPERATIONS = (operator.add, operator.sub, operator.mul, operator.truediv)
+COMPARISONS = (operator.lt, operator.le, operator.gt, operator.ge,
+               operator.eq, operator.ne)
+
+
+def fraction(b):
+    return Fraction(b.zaehler, b.nenner)
+
+
+class BruchTest(unittest.TestCase):
+
+    values = [(1, 2), (-3, 4), (6, -8), (0, 5), (7, 1), (2**70, 3**40)]
+
+    def test_reference(self):
+        for (a, b), (c, d) in itertools.product(self.values, repeat=2):
+            x, y = Bruch(a, b), Bruch(c, d)
+            fx, fy = Fraction(a, b), Fraction(c, d)
+            for op in OPERATIONS:
+                if op is operator.truediv and c == 0:
+                    continue
+                self.assertEqual(fraction(op(x, y)), op(fx, fy))
+                self.assertEqual(fraction(op(x, 3)), op(fx, 3))
+                self.assertEqual(fraction(op(3, y)), op(3, fy))
+            for op in COMPARISONS:
+                self.assertEqual(op(x, y), op(fx, fy))
+
+    def test_normalized(self):
+        b = Bruch(6, -8)
+        self.assertEqual((b.zaehler, b.nenner), (-3, 4))
+        with self.assertRaises(ZeroDivisionError):
+            Bruch(1, 0)
+
+    def test_numpy_integers(self):
+        self.assertEqual(fraction(Bruch(1, 2)+np.int64(1)), Fraction(3, 2))
+        self.assertEqual(fraction(Bruch(1, 2)*np.int32(4)), 2)
+
+    def test_hash(self):
+        for a, b in self.values:
+            self.assertEqual(hash(Bruch(a, b)), hash(Fraction(a, b)))
+        self.assertEqual(hash(Bruch(4, 2)), hash(2))
+        self.assertEqual(hash(Bruch(1, 2)), hash(0.5))
+        self.assertEqual(Bruch(1, 4), 0.25)
+
+
+class BruchArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.z = rng.integers(-1000, 1000, 50)
+        self.n = rng.integers(1, 1000, 50)*rng.choice([-1, 1], 50)
+        self.array = BruchArray(self.z, self.n)
+        self.fractions = [Fraction(int(z), int(n))
+                          for z, n in zip(self.z, self.n)]
+
+    def assertFractions(self, array, fractions):
+        self.assertEqual([fraction(b) for b in array], list(fractions))
+
+    def test_reference(self):
+        other = self.array[::-1]
+        for op in OPERATIONS[:3]:
+            self.assertFractions(op(self.array, other),
+                                 map(op, self.fractions, self.fractions[::-1]))
+            self.assertFractions(op(self.array, Bruch(2, 3)),
+                                 [op(f, Fraction(2, 3))
+                                  for f in self.fractions])
+            self.assertFractions(op(5, self.array),
+                                 [op(5, f) for f in self.fractions])
+        for op in COMPARISONS:
+            self.assertEqual(op(self.array, other).tolist(),
+                             list(map(op, self.fractions,
+                                      self.fractions[::-1])))
+
+    def test_sum(self):
+        for n in (0, 1, 2, 7, 50):
+            self.assertEqual(fraction(self.array[:n].sum()),
+                             sum(self.fractions[:n], Fraction(0)))
+
+    def test_overflow(self):
+        big = BruchArray([2**40, 3], [3**25, 2**40])
+        product = big*big
+        self.assertEqual(product.zaehler.dtype, object)
+        self.assertFractions(product, [Fraction(2**80, 3**50),
+                                       Fraction(9, 2**80)])
+        total = big+BruchArray([1, 1], [3**25+2, 2**40-1])
+        expected = [Fraction(2**40, 3**25)+Fraction(1, 3**25+2),
+                    Fraction(3, 2**40)+Fraction(1, 2**40-1)]
+        self.assertFractions(total, expected)
+        np.testing.assert_allclose(total.tofloat(), [float(f)
+                                                     for f in expected])
+
+    def test_from_bruch(self):
+        brueche = [Bruch(1, 3), Bruch(2**70, 3)]
+        self.assertFractions(BruchArray.from_bruch(brueche),
+                             map(fraction, brueche))
+
+    def test_zero_denominator(self):
+        with self.assertRaises(ZeroDivisionError):
+            BruchArray([1, 2], [1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from eidprog import datafile
+
+
+class LoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.filename = os.path.join(self.tmpdir.name, "messung.dat")
+        self.write(np.arange(30.0).reshape(10, 3))
+
+    def write(self, values):
+        with open(self.filename, "w") as f:
+            f.write("# x y z\n")
+            np.savetxt(f, values)
+
+    def test_reference(self):
+        expected = np.loadtxt(self.filename, ndmin=2)
+        np.testing.assert_array_equal(datafile.load(self.filename), expected)
+        self.assertTrue(os.path.exists(self.filename+".cache.npy"))
+        cached = datafile.load(self.filename)
+        self.assertIsInstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, expected)
+        leftovers = [name for name in os.listdir(self.tmpdir.name)
+                     if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_changed_file(self):
+        datafile.load(self.filename)
+        self.write(np.ones((4, 2)))
+        np.testing.assert_array_equal(datafile.load(self.filename),
+                                      np.ones((4, 2)))
+
+    def test_verify(self):
+        datafile.load(self.filename, verify=True)
+        stat = os.stat(self.filename)
+        self.write(np.arange(30.0).reshape(10, 3)[::-1])
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        reloaded = datafile.load(self.filename, verify=True)
+        np.testing.assert_array_equal(reloaded[0], [27, 28, 29])
+
+    def test_symlink(self):
+        link = os.path.join(self.tmpdir.name, "link.dat")
+        os.symlink(self.filename, link)
+        datafile.load(link)
+        self.assertTrue(os.path.exists(self.filename+".cache.npy"))
+        self.assertFalse(os.path.exists(link+".cache.npy"))
+
+    def test_data(self):
+        self.write(np.column_stack((np.arange(1000.0),
+                                    np.sin(np.arange(1000.0)))))
+        d = datafile.data(self.filename, maxpoints=100)
+        # the last point forms a column of its own
+        self.assertLessEqual(len(d.columns["x"]), 104)
+        np.testing.assert_allclose(d.columns["y"], np.sin(d.columns["x"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
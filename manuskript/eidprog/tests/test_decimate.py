@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from eidprog import decimate
+
+
+def minmax_reference(x, y, nbins, xmin, xmax):
+    columns = {}
+    for i, xi in enumerate(x):
+        column = min(max(int(np.floor((xi-xmin)*nbins/(xmax-xmin))), -1),
+                     nbins)
+        columns.setdefault(column, []).append(i)
+    indices = set()
+    for members in columns.values():
+        values = [y[i] for i in members]
+        indices.update((members[0], members[-1],
+                        members[values.index(min(values))],
+                        members[values.index(max(values))]))
+    return sorted(indices)
+
+
+class MinmaxTest(unittest.TestCase):
+
+    def test_reference(self):
+        rng = np.random.default_rng(1)
+        x = np.sort(rng.uniform(0, 10, 5000))
+        y = rng.normal(size=5000)
+        for nbins, xmin, xmax in ((50, 0, 10), (37, 2, 7), (10, -5, 20)):
+            self.assertEqual(decimate.minmax(x, y, nbins, xmin, xmax).tolist(),
+                             minmax_reference(x, y, nbins, xmin, xmax))
+
+    def test_short(self):
+        x = np.arange(10.0)
+        self.assertEqual(decimate.minmax(x, x, 3).tolist(), list(range(10)))
+
+
+class LttbTest(unittest.TestCase):
+
+    def test_endpoints(self):
+        rng = np.random.default_rng(2)
+        x = np.arange(1000.0)
+        y = rng.normal(size=1000)
+        indices = decimate.lttb(x, y, 50)
+        self.assertEqual(len(indices), 50)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+
+class PixelrunsTest(unittest.TestCase):
+
+    def test_segments_within_cell(self):
+        rng = np.random.default_rng(3)
+        x = np.cumsum(rng.normal(size=20000))
+        y = np.cumsum(rng.normal(size=20000))
+        indices = decimate.pixelruns(x, y, 5.0, 5.0)
+        ix = np.floor((x-x.min())/5.0)
+        iy = np.floor((y-y.min())/5.0)
+        for a, b in zip(indices[:-1], indices[1:]):
+            self.assertTrue(np.all(ix[a+1:b] == ix[a]))
+            self.assertTrue(np.all(iy[a+1:b] == iy[a]))
+
+
+class ReduceTest(unittest.TestCase):
+
+    def test_method(self):
+        x = np.linspace(0, 1, 10000)
+        xr, yr = decimate.reduce(x, np.sin(20*x), 100, 50)
+        self.assertLessEqual(len(xr), 400)
+        np.testing.assert_array_equal(yr, np.sin(20*xr))
+        with self.assertRaises(ValueError):
+            decimate.reduce(x, x, 100, 50, method="unbekannt")
+
+
+if __name__ == "__main__":
+    unittest.main()
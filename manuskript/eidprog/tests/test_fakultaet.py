@@ -0,0 +1,69 @@
+import math
+import unittest
+
+import numpy as np
+
+from eidprog import fakultaet
+
+
+class FakultaetTest(unittest.TestCase):
+
+    def setUp(self):
+        fakultaet.cache_clear()
+        self.addCleanup(fakultaet.cache_clear)
+
+    def test_reference(self):
+        for n in (0, 1, 2, 10, 100, 1000, 1050, 1100, 999, 5000, 5300):
+            self.assertEqual(fakultaet.fakultaet(n), math.factorial(n))
+
+    def test_cache(self):
+        for n in range(2*fakultaet.CACHESIZE):
+            fakultaet.fakultaet(1000+10*n)
+        self.assertEqual(len(fakultaet._cache), fakultaet.CACHESIZE)
+        self.assertEqual(fakultaet._keys, sorted(fakultaet._cache))
+        self.assertEqual(fakultaet.fakultaet(1005), math.factorial(1005))
+        fakultaet.cache_clear()
+        self.assertEqual(len(fakultaet._cache), 0)
+
+    def test_produkt(self):
+        self.assertEqual(fakultaet.produkt(5, 5), 1)
+        self.assertEqual(fakultaet.produkt(1, 101), math.factorial(100))
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            fakultaet.fakultaet(-1)
+        self.assertEqual(fakultaet.fakultaet_rekursiv(20),
+                         math.factorial(20))
+
+
+class LogarithmTest(unittest.TestCase):
+
+    def test_log_factorial(self):
+        n = np.array([0, 1, 2, 10, 255, 256, 257, 1000, 10**6, 10**12])
+        expected = [math.lgamma(k+1) for k in n.tolist()]
+        np.testing.assert_allclose(fakultaet.log_factorial(n), expected,
+                                   rtol=1e-14)
+        with self.assertRaises(ValueError):
+            fakultaet.log_factorial([-1])
+        with self.assertRaises(ValueError):
+            fakultaet.log_factorial([1.5])
+
+    def test_binomial(self):
+        n, k = np.meshgrid(np.arange(0, 300, 7), np.arange(-2, 300, 5))
+        expected = [[float(math.comb(a, b)) if 0 <= b <= a else 0.0
+                     for a, b in zip(rn, rk)]
+                    for rn, rk in zip(n.tolist(), k.tolist())]
+        b = fakultaet.binomial(n, k)
+        np.testing.assert_allclose(b, expected, rtol=1e-12)
+        exact = np.array(expected) < 2.0**53
+        np.testing.assert_array_equal(b[exact], np.array(expected)[exact])
+        self.assertEqual(fakultaet.binomial(2000, 1000), np.inf)
+
+    def test_log_binomial(self):
+        self.assertEqual(fakultaet.log_binomial(5, 6), -np.inf)
+        self.assertAlmostEqual(float(fakultaet.log_binomial(2000, 1000)),
+                               math.log(math.comb(2000, 1000)), places=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
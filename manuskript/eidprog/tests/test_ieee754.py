@@ -0,0 +1,87 @@
+import math
+import struct
+import unittest
+
+import numpy as np
+
+from eidprog import ieee754
+
+VALUES = [0.0, -0.0, 1.0, -1.5, 0.1, 5e-324, -2.5e-310,
+          2.2250738585072014e-308, 1.7976931348623157e308, math.inf,
+          -math.inf, math.nan]
+
+
+def reference(x):
+    b = struct.unpack(">Q", struct.pack(">d", x))[0]
+    return b >> 63, (b >> 52) & 0x7ff, b & (2**52-1)
+
+
+def klasse(x):
+    if math.isnan(x):
+        return "nan"
+    if math.isinf(x):
+        return "infinite"
+    if x == 0:
+        return "zero"
+    if abs(x) < 2.2250738585072014e-308:
+        return "subnormal"
+    return "normal"
+
+
+class DecomposeTest(unittest.TestCase):
+
+    def test_reference(self):
+        sign, exponent, significand = ieee754.decompose(np.array(VALUES))
+        self.assertEqual(list(zip(sign.tolist(), exponent.tolist(),
+                                  significand.tolist())),
+                         [reference(x) for x in VALUES])
+
+    def test_float32(self):
+        x = np.array([1.0, -0.1, 1e-40, np.inf], dtype=np.float32)
+        sign, exponent, significand = ieee754.decompose(x)
+        expected = [struct.unpack(">I", struct.pack(">f", v))[0]
+                    for v in x.tolist()]
+        self.assertEqual(((sign.astype(np.uint32) << 31)
+                          | (exponent.astype(np.uint32) << 23)
+                          | significand).tolist(), expected)
+
+    def test_classify(self):
+        classes = ieee754.classify(np.array(VALUES))
+        self.assertEqual([ieee754.CLASSES[c] for c in classes],
+                         [klasse(x) for x in VALUES])
+        self.assertEqual(ieee754.counts(np.array(VALUES)),
+                         {"zero": 2, "subnormal": 2, "normal": 5,
+                          "infinite": 2, "nan": 1})
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            ieee754.bits(np.arange(3))
+
+
+class UlpTest(unittest.TestCase):
+
+    def test_reference(self):
+        rng = np.random.default_rng(7)
+        for dtype in (np.float64, np.float32):
+            a = rng.normal(size=50).astype(dtype)
+            a[:5] = [0, -0.0, 1, -1, np.finfo(dtype).tiny]
+            steps = rng.integers(0, 20, 50)
+            b = a.copy()
+            for i, n in enumerate(steps):
+                for _ in range(n):
+                    b[i] = np.nextafter(b[i], dtype(np.inf))
+            self.assertEqual(ieee754.ulp_distance(a, b).tolist(),
+                             steps.tolist())
+            self.assertEqual(ieee754.ulp_distance(b, a).tolist(),
+                             steps.tolist())
+
+    def test_special(self):
+        d = ieee754.ulp_distance(np.array([0.0, -5e-324, 1.0, np.nan]),
+                                 np.array([-0.0, 5e-324, 1.0+2**-52, 1.0]))
+        self.assertEqual(d.tolist(), [0, 2, 1, 2**64-1])
+        with self.assertRaises(TypeError):
+            ieee754.ulp_distance(np.float32(1), np.float64(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from eidprog.koerper import Ensemble, Massepunkt, Rotationskoerper
+
+
+def rotated(drehachse, winkel, achse):
+    k = np.asarray(drehachse, dtype=float)
+    k = k/np.linalg.norm(k, axis=-1, keepdims=True)
+    rotvec = k*np.radians(np.asarray(winkel, dtype=float))[..., np.newaxis]
+    return Rotation.from_rotvec(rotvec).apply(achse)
+
+
+class EnsembleTest(unittest.TestCase):
+
+    def test_reference(self):
+        rng = np.random.default_rng(5)
+        for quaternionen in (False, True):
+            ensemble = Ensemble(20, quaternionen)
+            expected = ensemble.achse.copy()
+            for _ in range(10):
+                drehachse = rng.normal(size=(20, 3))
+                winkel = rng.uniform(-180, 180, 20)
+                ensemble.drehe(drehachse, winkel)
+                expected = rotated(drehachse, winkel, expected)
+            np.testing.assert_allclose(ensemble.achse, expected, atol=1e-12)
+
+    def test_maske(self):
+        for maske in (np.arange(10) % 3 == 0, [1, 4]):
+            ensemble = Ensemble(10)
+            ensemble.drehe([1, 0, 0], 90, maske)
+            ensemble.verschiebe([1, 2, 3], maske)
+            expected = np.zeros((10, 3))
+            expected[maske] = [1, 2, 3]
+            np.testing.assert_array_equal(ensemble.pos, expected)
+            achse = np.tile([0.0, 0, 1], (10, 1))
+            achse[maske] = [0, -1, 0]
+            np.testing.assert_allclose(ensemble.achse, achse, atol=1e-15)
+
+    def test_normalized(self):
+        ensemble = Ensemble(5, quaternionen=True)
+        for _ in range(2000):
+            ensemble.drehe([1, 2, 3], 0.7)
+        np.testing.assert_allclose(np.linalg.norm(ensemble.achse, axis=1),
+                                   1, rtol=1e-14)
+
+
+class ViewTest(unittest.TestCase):
+
+    def test_views(self):
+        ensemble = Ensemble(3)
+        koerper = ensemble.rotationskoerper(1)
+        koerper.verschiebe([1, 0, 0])
+        koerper.drehe([0, 1, 0], 90)
+        np.testing.assert_array_equal(ensemble.pos[1], [1, 0, 0])
+        np.testing.assert_allclose(ensemble.achse[1], [1, 0, 0], atol=1e-15)
+        np.testing.assert_array_equal(ensemble.achse[0], [0, 0, 1])
+        punkt = Massepunkt()
+        punkt.pos = [1, 2, 3]
+        np.testing.assert_array_equal(punkt.ensemble.pos, [[1, 2, 3]])
+        self.assertEqual(len(Rotationskoerper().ensemble), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import integrate
+
+from eidprog import oszillator
+
+
+def exact(gamma, x0, p0, t):
+    """Position of the underdamped oscillator, gamma < 2."""
+    gamma, x0, p0 = (np.asarray(a)[:, np.newaxis] for a in (gamma, x0, p0))
+    omega = np.sqrt(1-gamma**2/4)
+    return np.exp(-gamma*t/2)*(x0*np.cos(omega*t)
+                               + (p0+gamma*x0/2)/omega*np.sin(omega*t))
+
+
+class SolveTest(unittest.TestCase):
+
+    pts = np.linspace(0, 10, 51)
+
+    def test_exact(self):
+        gamma, x0, p0 = oszillator.grid([0.0, 0.3, 1.5], [0.0, 1.0],
+                                        [1.0, -0.5])
+        x, p = oszillator.solve(gamma, x0, p0, self.pts, 1e-10, 1e-10)
+        np.testing.assert_allclose(x, exact(gamma, x0, p0, self.pts),
+                                   atol=1e-8)
+
+    def test_single(self):
+        # the batch is at least as accurate as every oscillator on its own
+        gamma = np.linspace(0, 3, 7)
+        x, p = oszillator.solve(gamma, 1.0, 0.0, self.pts)
+        for i, g in enumerate(gamma):
+            y = integrate.odeint(lambda y, t: [y[1], -y[0]-g*y[1]],
+                                 [1.0, 0.0], self.pts)
+            np.testing.assert_allclose(x[i], y[:, 0], atol=1e-6)
+            np.testing.assert_allclose(p[i], y[:, 1], atol=1e-6)
+
+
+class SweepTest(unittest.TestCase):
+
+    def test_sweep(self):
+        gamma, x0, p0 = oszillator.grid(np.linspace(0, 1.9, 11), [0.0, 1.0])
+        pts = np.linspace(0, 5, 21)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for jobs in (1, 2):
+                filename = os.path.join(tmpdir, "sweep%d.npy" % jobs)
+                oszillator.sweep(filename, gamma, x0, p0, pts, batch=4,
+                                 jobs=jobs)
+                result = oszillator.load(filename)
+                np.testing.assert_array_equal(result["gamma"], gamma)
+                np.testing.assert_array_equal(result["x0"], x0)
+                self.assertEqual(result["x"].shape, (len(pts), len(gamma)))
+                np.testing.assert_allclose(result["x"],
+                                           exact(gamma, x0, p0, pts).T,
+                                           atol=1e-6)
+                del result
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from eidprog import primzahlen
+from eidprog.primzahlen import PrimeTable
+
+
+def sieve(limit):
+    """Plain sieve of Eratosthenes as reference."""
+    flags = [True]*max(limit, 2)
+    flags[0] = flags[1] = False
+    for p in range(2, int(limit**0.5)+1):
+        if flags[p]:
+            for m in range(p*p, limit, p):
+                flags[m] = False
+    return [n for n in range(limit) if flags[n]]
+
+
+def trial_division(n):
+    if n < 2:
+        return False
+    p = 2
+    while p*p <= n:
+        if n % p == 0:
+            return False
+        p = p+1
+    return True
+
+
+class SieveTest(unittest.TestCase):
+
+    primes = sieve(20000)
+
+    def test_small_primes(self):
+        for limit in (0, 2, 3, 4, 100, 20000):
+            self.assertEqual(primzahlen.small_primes(limit).tolist(),
+                             [p for p in self.primes if p < limit])
+
+    def test_segments(self):
+        for lo, hi in ((-10, 10), (0, 20000), (1, 2), (2, 3), (3, 4),
+                       (9000, 13579), (19990, 20000)):
+            expected = [p for p in self.primes if lo <= p < hi]
+            for size in (7, 64, 1000):
+                chunks = primzahlen.iter_primes(lo, hi, size)
+                self.assertEqual(np.concatenate(
+                    [np.zeros(0, np.int64), *chunks]).tolist(), expected)
+                self.assertEqual(primzahlen.count_primes(lo, hi, size),
+                                 len(expected))
+
+    def test_miller_rabin(self):
+        for n in range(-5, 3000):
+            self.assertEqual(primzahlen.miller_rabin(n), trial_division(n))
+        for n in range(10**10, 10**10+200):
+            self.assertEqual(primzahlen.miller_rabin(n), trial_division(n))
+        # strong pseudoprimes to the bases 2, 3, 5 and 7
+        self.assertFalse(primzahlen.miller_rabin(3215031751))
+        self.assertTrue(primzahlen.miller_rabin(2**61-1))
+
+
+class PrimeTableTest(unittest.TestCase):
+
+    primes = sieve(20000)
+    primes_set = set(primes)
+
+    def test_table(self):
+        table = PrimeTable(limit=1000, maxlimit=10000)
+        for n in range(20000):
+            self.assertEqual(table.is_prime(n), n in self.primes_set)
+        self.assertEqual(table.limit, 10000)
+        for lo, hi in ((0, 100), (500, 1500), (9000, 20000), (5, 5),
+                       (100, 50)):
+            self.assertEqual(table.primes_between(lo, hi).tolist(),
+                             [p for p in self.primes if lo <= p < hi])
+        for n in (1, 2, 100, 1229, 1230, 2262):
+            self.assertEqual(table.nth_prime(n), self.primes[n-1])
+
+    def test_far_numbers(self):
+        table = PrimeTable(limit=1000)
+        self.assertTrue(table.is_prime(10**12+39))
+        self.assertEqual(table.primes_between(10**6, 10**6+100).tolist(),
+                         [n for n in range(10**6, 10**6+100)
+                          if trial_division(n)])
+        self.assertEqual(table.limit, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
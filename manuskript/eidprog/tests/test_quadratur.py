@@ -0,0 +1,73 @@
+import unittest
+from math import pi
+
+import numpy as np
+from scipy import integrate, special
+
+from eidprog import quadratur
+
+
+def reference(f, a, b, args):
+    a, b, *args = np.broadcast_arrays(a, b, *args)
+    return np.array([integrate.quad(f, lo, hi, tuple(p), epsabs=1e-13)[0]
+                     for lo, hi, *p in zip(a.ravel(), b.ravel(),
+                                           *(p.ravel() for p in args))]
+                    ).reshape(a.shape)
+
+
+def gauss(x, s):
+    return np.exp(-s*x**2)
+
+
+class GaussLegendreTest(unittest.TestCase):
+
+    def test_quad(self):
+        s = np.linspace(0.5, 3, 6)
+        b = np.array([[1.0], [2.0]])
+        result, error = quadratur.gauss_legendre(gauss, -1, b, (s,))
+        self.assertEqual(result.shape, (2, 6))
+        expected = reference(gauss, -1, b, (s,))
+        np.testing.assert_allclose(result, expected, rtol=1e-13)
+        self.assertTrue(np.all(np.abs(result-expected) <= error+1e-15))
+
+    def test_bessel(self):
+        z = np.linspace(0, 20, 41)
+        result, error = quadratur.gauss_legendre(
+            lambda x, z: np.cos(z*np.cos(x)), 0, pi, (z,), n=64)
+        np.testing.assert_allclose(result/pi, special.j0(z), atol=1e-13)
+
+    def test_error_estimate(self):
+        # the estimate covers the actual error once the oscillations are
+        # roughly resolved
+        z = np.linspace(5, 15, 11)
+        for n in (12, 16, 24, 32):
+            result, error = quadratur.gauss_legendre(
+                lambda x, z: np.cos(z*np.cos(x)), 0, pi, (z,), n=n)
+            actual = np.abs(result-pi*special.j0(z))
+            self.assertTrue(np.all(actual <= error))
+        panels, _ = quadratur.gauss_legendre(
+            lambda x, z: np.cos(z*np.cos(x)), 0, pi, (z,), n=8, panels=8)
+        np.testing.assert_allclose(panels/pi, special.j0(z), atol=1e-10)
+
+
+class TanhSinhTest(unittest.TestCase):
+
+    def test_singular(self):
+        p = np.array([-0.5, -0.8, 0.0, 2.0])
+        result, error = quadratur.tanh_sinh(lambda x, p: x**p, 0, 1, (p,),
+                                            tmax=4.5)
+        np.testing.assert_allclose(result, 1/(p+1), rtol=1e-11)
+        result, error = quadratur.tanh_sinh(np.log, 0, 1)
+        self.assertAlmostEqual(float(result), -1, places=12)
+        self.assertLessEqual(abs(float(result)+1), float(error)+1e-15)
+
+    def test_quad(self):
+        s = np.linspace(0.5, 3, 6)
+        result, error = quadratur.tanh_sinh(gauss, -1, 2, (s,))
+        expected = reference(gauss, -1, 2, (s,))
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+        self.assertTrue(np.all(np.abs(result-expected) <= error+1e-15))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import math
+import unittest
+
+import numpy as np
+from scipy import special
+
+from eidprog import reihen
+
+
+class AkkumulatorTest(unittest.TestCase):
+
+    def test_fsum(self):
+        rng = np.random.default_rng(8)
+        terms = rng.normal(size=10000)*10.0**rng.integers(-10, 10, 10000)
+        acc = reihen.Akkumulator()
+        for chunk in np.array_split(terms, 100):
+            acc.add(chunk)
+        self.assertAlmostEqual(acc.wert, math.fsum(terms),
+                               delta=1e-6*math.fsum(abs(terms)))
+        acc = reihen.Akkumulator()
+        acc.extend(iter([1e16, 1.0, -1e16, 1.0]), chunksize=1)
+        self.assertEqual(acc.wert, 2.0)
+
+    def test_merge(self):
+        a, b = reihen.Akkumulator(), reihen.Akkumulator()
+        a.extend([1e16, 1.0], chunksize=1)
+        b.extend([-1e16, 1.0], chunksize=1)
+        a.merge(b)
+        self.assertEqual(a.wert, 2.0)
+
+
+class SummeTest(unittest.TestCase):
+
+    def test_fsum(self):
+        for start, stop, chunksize in ((1, 1000, 7), (5, 5, 3),
+                                       (1, 10**5, 2**10)):
+            expected = math.fsum(1/k**2 for k in range(start, stop+1))
+            self.assertAlmostEqual(
+                reihen.summe(lambda k: 1/k**2, start, stop, chunksize),
+                expected, delta=2e-16*expected)
+        self.assertEqual(reihen.summe(lambda k: k, 3, 2), 0.0)
+
+    def test_potenzrest(self):
+        # the Hurwitz zeta function is the rest of the series
+        for s in (2, 3, 4.5):
+            for n, rtol in ((11, 1e-9), (100, 1e-15)):
+                self.assertAlmostEqual(reihen.potenzrest(s, n),
+                                       special.zeta(s, n),
+                                       delta=rtol*special.zeta(s, n))
+            fehler = [abs(reihen.potenzrest(s, 11, ordnung)
+                          - special.zeta(s, 11))
+                      for ordnung in range(5)]
+            self.assertEqual(fehler, sorted(fehler, reverse=True))
+
+    def test_inverse_squares(self):
+        s = reihen.summe(lambda k: 1/k**2, 1, 10)+reihen.potenzrest(2, 11)
+        self.assertAlmostEqual(s, math.pi**2/6, delta=1e-12)
+
+
+class RichardsonTest(unittest.TestCase):
+
+    def test_inverse_squares(self):
+        wert, fehler = reihen.richardson(lambda k: 1/k**2, n=16, stufen=6)
+        self.assertLess(abs(wert-math.pi**2/6), 1e-10)
+        self.assertLess(abs(wert-math.pi**2/6), 10*fehler+1e-15)
+
+    def test_orders(self):
+        # every level removes one further power of 1/n
+        fehler = []
+        for stufen in range(4):
+            wert, _ = reihen.richardson(lambda k: 1/k**2, n=8,
+                                        stufen=stufen)
+            fehler.append(abs(wert-math.pi**2/6))
+        for a, b in zip(fehler[:-1], fehler[1:]):
+            self.assertLess(b, a/8)
+
+    def test_exponent(self):
+        # the rest of the series of k**-3 begins with 1/(2*n**2)
+        wert, _ = reihen.richardson(lambda k: 1/k**3, n=16, stufen=6,
+                                    exponent=2)
+        self.assertLess(abs(wert-special.zeta(3)), 1e-11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from eidprog.resultate import ALIGNMENT, ResultStore
+
+
+class ResultStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.filename = os.path.join(self.tmpdir.name, "resultate.bin")
+
+    def expected(self, parameter):
+        n = np.arange(parameter, dtype=np.int64)
+        return n*n
+
+    def test_write_reopen(self):
+        with ResultStore(self.filename, "w", chunksize=64) as store:
+            for parameter in range(20):
+                store.write(parameter, self.expected(parameter))
+            with store.writer("stueckweise", np.float64, (2,)) as w:
+                for n in range(100):
+                    w.write([n, n/2])
+                w.write(np.ones((50, 2)))
+        with ResultStore(self.filename) as store:
+            self.assertEqual(store.parameters(),
+                             list(range(20))+["stueckweise"])
+            for parameter in range(20):
+                np.testing.assert_array_equal(store[parameter],
+                                              self.expected(parameter))
+                self.assertEqual(store.index[str(parameter)]["offset"]
+                                 % ALIGNMENT, 0)
+            values = store["stueckweise"]
+            self.assertEqual(values.shape, (150, 2))
+            np.testing.assert_array_equal(values[:100, 1],
+                                          np.arange(100)/2)
+            with self.assertRaises(ValueError):
+                store.write(20, [1])
+
+    def test_append(self):
+        with ResultStore(self.filename, "w") as store:
+            store.write(1, self.expected(1))
+        with ResultStore(self.filename, "a") as store:
+            store.write([2, "b"], self.expected(2))
+            with self.assertRaises(KeyError):
+                store.write(1, [0])
+        with ResultStore(self.filename) as store:
+            self.assertEqual(store.parameters(), [1, [2, "b"]])
+            np.testing.assert_array_equal(store[[2, "b"]], self.expected(2))
+
+    def test_crash_while_appending(self):
+        with ResultStore(self.filename, "w") as store:
+            store.write(1, self.expected(1))
+        store = ResultStore(self.filename, "a")
+        store.write(2, np.arange(10**5))
+        # the process dies before the index is written
+        store._file.close()
+        with ResultStore(self.filename) as store:
+            self.assertEqual(store.parameters(), [1])
+        with ResultStore(self.filename, "a") as store:
+            store.write(3, self.expected(3))
+        with ResultStore(self.filename) as store:
+            self.assertEqual(store.parameters(), [1, 3])
+            np.testing.assert_array_equal(store[3], self.expected(3))
+
+    def test_discard(self):
+        with ResultStore(self.filename, "w") as store:
+            with self.assertRaises(RuntimeError):
+                with store.writer(1, np.int64) as w:
+                    w.write(5)
+                    raise RuntimeError
+            store.write(2, [])
+        with ResultStore(self.filename) as store:
+            self.assertEqual(store.parameters(), [2])
+            self.assertEqual(store[2].shape, (0,))
+
+    def test_not_a_result_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"0123456789")
+        with self.assertRaises(ValueError):
+            ResultStore(self.filename)
+
+    def test_export_text(self):
+        with ResultStore(self.filename, "w") as store:
+            for parameter in range(3):
+                store.write(parameter, self.expected(parameter+1))
+            pattern = os.path.join(self.tmpdir.name, "resultate_{:05}.dat")
+            store.export_text(pattern)
+        for parameter in range(3):
+            text = np.loadtxt(pattern.format(parameter), dtype=np.int64,
+                              ndmin=1)
+            np.testing.assert_array_equal(text, self.expected(parameter+1))
+
+
+if __name__ == "__main__":
+    unittest.main()
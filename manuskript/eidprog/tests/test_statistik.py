@@ -0,0 +1,95 @@
+import math
+import unittest
+
+import numpy as np
+
+from eidprog.statistik import Statistik, mittelwert
+
+
+class StatistikTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.werte = rng.normal(1e6, 3, 10000)
+
+    def assertMoments(self, stat, werte):
+        self.assertEqual(stat.anzahl, len(werte))
+        self.assertAlmostEqual(stat.mittelwert, np.mean(werte), delta=1e-8)
+        for ddof in (0, 1):
+            self.assertAlmostEqual(stat.varianz(ddof),
+                                   np.var(werte, ddof=ddof), delta=1e-8)
+        self.assertEqual((stat.minimum, stat.maximum),
+                         (np.min(werte), np.max(werte)))
+
+    def test_reference(self):
+        stat = Statistik(chunksize=999)
+        stat.add(self.werte[:5000])
+        for x in self.werte[5000:5100]:
+            stat.add(x)
+        stat.extend(iter(self.werte[5100:].tolist()))
+        self.assertMoments(stat, self.werte)
+        self.assertAlmostEqual(mittelwert(self.werte.tolist()),
+                               np.mean(self.werte), delta=1e-8)
+
+    def test_empty(self):
+        stat = Statistik()
+        self.assertTrue(math.isnan(stat.varianz()))
+        stat.add(2.0)
+        self.assertEqual(stat.varianz(), 0.0)
+        self.assertTrue(math.isnan(stat.varianz(ddof=1)))
+        with self.assertRaises(ValueError):
+            stat.quantil(0.5)
+
+    def test_merge(self):
+        teile = np.array_split(self.werte, [0, 1, 3000, 7000])
+        stat = Statistik(reservoir=100, seed=1)
+        for teil in teile:
+            other = Statistik(reservoir=100, seed=2)
+            other.add(teil)
+            stat.merge(other)
+        self.assertMoments(stat, self.werte)
+        self.assertEqual(len(stat._stichprobe), 100)
+        self.assertTrue(np.all(np.isin(stat._stichprobe, self.werte)))
+        with self.assertRaises(ValueError):
+            stat.merge(Statistik(reservoir=10))
+        with self.assertRaises(ValueError):
+            Statistik().merge(stat)
+
+
+class QuantilTest(unittest.TestCase):
+
+    q = [0, 0.1, 0.5, 0.9, 1]
+
+    def test_exact(self):
+        werte = np.random.default_rng(10).exponential(size=500)
+        stat = Statistik(reservoir=500)
+        stat.add(werte)
+        np.testing.assert_array_equal(stat.quantil(self.q),
+                                      np.quantile(werte, self.q))
+        a, b = Statistik(reservoir=500), Statistik(reservoir=500)
+        a.add(werte[:200])
+        b.add(werte[200:])
+        a.merge(b)
+        np.testing.assert_array_equal(a.quantil(self.q),
+                                      np.quantile(werte, self.q))
+
+    def test_uniform_sample(self):
+        # the reservoir is a uniform sample: the mean position of the
+        # sampled values in the stream is the middle of the stream
+        werte = np.arange(100000, dtype=float)
+        positionen = []
+        for seed in range(20):
+            stat = Statistik(reservoir=200, seed=seed, chunksize=3000)
+            stat.add(werte[:60000])
+            other = Statistik(reservoir=200, seed=seed+100)
+            other.add(werte[60000:])
+            stat.merge(other)
+            positionen.append(np.mean(stat._stichprobe))
+        self.assertAlmostEqual(np.mean(positionen)/len(werte), 0.5,
+                               delta=0.01)
+        self.assertAlmostEqual(stat.quantil(0.5)/len(werte), 0.5,
+                               delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Parallel and cached compilation of the Unicode tables.
+
+Instead of typesetting all tables in one XeLaTeX run, every block of 128
+code points is written to a document of its own.  The documents are
+compiled in parallel, the page containing the table is extracted with
+``pdftk`` and cropped with ``pdfcrop``.  The resulting PDF files
+are stored in a cache directory under the SHA-256 hash of the document, so
+that unchanged blocks are never compiled again.  Finally, the pages can be
+stitched together with ``pdftk``, and the tables of single blocks, given by
+any of their code points, can be copied to files ``uXXXX.pdf`` named after
+the first code point of the block.
+
+Usage, for the code points from U+0000 to U+2CFF and the tables of the
+blocks starting at U+0000 and U+2200::
+
+    python -m eidprog.unicodebuild 0 0x2D00 --stitch unicode_cropped.pdf \
+        --extract 0 0x2200
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from . import unicodetables
+
+XELATEX = "xelatex"
+PDFCROP = "pdfcrop"
+PDFTK = "pdftk"
+
+
+def fragment(block):
+    """Return the XeLaTeX document for a single block."""
+    return unicodetables.document([block])
+
+
+def digest(source):
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def compile_block(source, target):
+    """Compile and crop a document, the result is written to ``target``.
+
+    Returns the log output if the compilation failed, otherwise None.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tex = Path(tmpdir) / "block.tex"
+        tex.write_text(source)
+        cmds = [[XELATEX, "-interaction=batchmode", "-halt-on-error",
+                 tex.name],
+                [PDFTK, "block.pdf", "cat", "end", "output", "table.pdf"],
+                [PDFCROP, "table.pdf", "cropped.pdf"]]
+        for cmd in cmds:
+            try:
+                result = subprocess.run(cmd, cwd=tmpdir, capture_output=True,
+                                        text=True)
+            except OSError as e:
+                return str(e)+"\n"
+            if result.returncode:
+                log = Path(tmpdir) / "block.log"
+                return log.read_text() if log.exists() else result.stderr
+        shutil.move(Path(tmpdir) / "cropped.pdf", target)
+    return None
+
+
+def build(blocks, cachedir, jobs=None):
+    """Compile all blocks not yet in the cache.
+
+    Returns the list of cached PDF files in the order of ``blocks`` and the
+    number of failed blocks.
+    """
+    cachedir = Path(cachedir)
+    cachedir.mkdir(parents=True, exist_ok=True)
+    pdfs = []
+    todo = {}
+    for block in blocks:
+        source = fragment(block)
+        pdf = cachedir / (digest(source)+".pdf")
+        pdfs.append(pdf)
+        if not pdf.exists():
+            todo[pdf] = (block, source)
+    failures = 0
+    with concurrent.futures.ThreadPoolExecutor(jobs or os.cpu_count()) as ex:
+        futures = {ex.submit(compile_block, source, pdf): block
+                   for pdf, (block, source) in todo.items()}
+        for future in concurrent.futures.as_completed(futures):
+            block = futures[future]
+            error = future.result()
+            if error is None:
+                print("compiled U+%04X" % (block*unicodetables.BLOCKSIZE))
+            else:
+                failures = failures+1
+                print("failed U+%04X" % (block*unicodetables.BLOCKSIZE),
+                      file=sys.stderr)
+                sys.stderr.write(error)
+    return pdfs, failures
+
+
+def stitch(pdfs, output):
+    """Concatenate the PDF files into ``output``."""
+    subprocess.run([PDFTK, *map(str, pdfs), "cat", "output", str(output)],
+                   check=True)
+
+
+def extract(pdfs, blocks, codepoints):
+    """Copy the tables of the blocks containing the code points."""
+    for cp in codepoints:
+        block = cp//unicodetables.BLOCKSIZE
+        target = "u%04X.pdf" % (block*unicodetables.BLOCKSIZE)
+        shutil.copyfile(pdfs[blocks.index(block)], target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("start", type=lambda s: int(s, 0),
+                        help="first code point")
+    parser.add_argument("stop", type=lambda s: int(s, 0),
+                        help="code point following the last one")
+    parser.add_argument("--cache", default=".blocks",
+                        help="directory of the compiled blocks")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="number of XeLaTeX runs in parallel")
+    parser.add_argument("--stitch", metavar="FILE",
+                        help="concatenate all blocks into FILE")
+    parser.add_argument("--extract", metavar="CP", nargs="+", default=[],
+                        type=lambda s: int(s, 0),
+                        help="copy the tables of the blocks containing the "
+                        "code points CP to uXXXX.pdf")
+    args = parser.parse_args(argv)
+    size = unicodetables.BLOCKSIZE
+    blocks = range(args.start//size, -(-args.stop//size))
+    for cp in args.extract:
+        if cp//size not in blocks:
+            parser.error("U+%04X is not in the range built" % cp)
+    pdfs, failures = build(blocks, args.cache, args.jobs)
+    if failures:
+        return 1
+    if args.stitch:
+        stitch(pdfs, args.stitch)
+    extract(pdfs, blocks, args.extract)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Tables of Unicode characters with their UTF-8 encoding.
+
+Each table covers a block of 128 code points, arranged in 16 rows and 8
+columns.  For every code point the table shows its number, its UTF-8
+encoding in hexadecimal notation and the character itself or, for control
+codes, their abbreviation.  All code points up to U+10FFFF are supported.
+Code points, UTF-8 encodings and cell contents are computed for all
+requested blocks at once with NumPy, and every table is produced as one
+string.
+"""
+
+import numpy as np
+
+CONTROLCODES = {0x00: "NUL", 0x01: "SOH", 0x02: "STX", 0x03: "ETX",
+                0x04: "EOT", 0x05: "ENQ", 0x06: "ACK", 0x07: "BEL",
+                0x08: "BS", 0x09: "HT", 0x0A: "LF", 0x0B: "VT",
+                0x0C: "FF", 0x0D: "CR", 0x0E: "SO", 0x0F: "SI",
+                0x10: "DLE", 0x11: "DC1", 0x12: "DC2", 0x13: "DC3",
+                0x14: "DC4", 0x15: "NAK", 0x16: "SYN", 0x17: "ETB",
+                0x18: "CAN", 0x19: "EM", 0x1A: "SUB", 0x1B: "ESC",
+                0x1C: "FS", 0x1D: "GS", 0x1E: "RS", 0x1F: "US",
+                0x20: "SP", 0x7F: "DEL", 0x80: "XXX", 0x81: "XXX",
+                0x82: "BPH", 0x83: "NBH", 0x84: "IND", 0x85: "NEL",
+                0x86: "SSA", 0x87: "ESA", 0x88: "HTS", 0x89: "HTJ",
+                0x8A: "VTS", 0x8B: "PLD", 0x8C: "PLU", 0x8D: "RI",
+                0x8E: "SS2", 0x8F: "SS3", 0x90: "DCS", 0x91: "PU1",
+                0x92: "PU2", 0x93: "STS", 0x94: "CCH", 0x95: "MW",
+                0x96: "SPA", 0x97: "EPA", 0x98: "SOS", 0x99: "XXX",
+                0x9A: "SCI", 0x9B: "CSI", 0x9C: "ST", 0x9D: "OSC",
+                0x9E: "PM", 0x9F: "APC", 0xA0: "NBSP", 0xAD: "SHY"}
+
+BLOCKSIZE = 128
+MAXCODEPOINT = 0x10FFFF
+NBLOCKS = (MAXCODEPOINT+1)//BLOCKSIZE
+
+PREAMBLE = """%!TEX TS-program = xetex
+%!TEX encoding = UTF-8 Unicode
+\\documentclass{article}
+\\usepackage{xunicode}
+\\usepackage{fontspec}
+\\usepackage{xltxtra}
+\\usepackage{colortbl}
+\\setromanfont[Mapping=tex-text]{FreeSerif}
+\\definecolor{grau1}{rgb}{0.7,0.7,0.7}
+\\definecolor{grau2}{rgb}{0.9,0.9,0.9}
+\\definecolor{cc}{rgb}{0.7,0.7,0.7}
+\\begin{document}
+\\pagestyle{empty}
+\\newcommand{\\PreserveBackslash}[1]{\\let\\temp=\\\\#1\\let\\\\=\\temp}
+\\renewcommand{\\arraystretch}{0.8}
+"""
+
+END = "\\end{document}\n"
+
+_HEAD = ("\\noindent\n\\begin{tabular}{%s|}\n\\hline\n"
+         % ("|>{\\PreserveBackslash\\centering}p{12mm}"*8))
+_TAIL = "\\end{tabular}\n\n"
+
+
+def codepoints(blocks):
+    """Return the code points of the given blocks in table order.
+
+    The result has shape ``(len(blocks), 16, 8)``, the last two indices
+    denote row and column of the table.
+    """
+    blocks = np.asarray(blocks, dtype=np.int64).reshape(-1, 1, 1)
+    lsb = np.arange(16).reshape(1, 16, 1)
+    msb = np.arange(8).reshape(1, 1, 8)
+    return (blocks << 7)+(msb << 4)+lsb
+
+
+def utf8(cp):
+    """Return the UTF-8 encoding as integers and the number of bytes.
+
+    Surrogates are encoded like other code points of the same range.
+    """
+    cp = np.asarray(cp, dtype=np.uint64)
+    nbytes = (1+(cp >= 0x80)+(cp >= 0x800)+(cp >= 0x10000)).astype(np.int64)
+    low = cp & 0x3f
+    mid = (cp >> 6) & 0x3f
+    high = (cp >> 12) & 0x3f
+    code = np.where(nbytes == 2, 0xC080 | ((cp >> 6) << 8) | low, cp)
+    code = np.where(nbytes == 3,
+                    0xE08080 | ((cp >> 12) << 16) | (mid << 8) | low, code)
+    code = np.where(nbytes == 4,
+                    0xF0808080 | ((cp >> 18) << 24) | (high << 16)
+                    | (mid << 8) | low, code)
+    return code, nbytes
+
+
+def hex_string(codepoint):
+    """Return the UTF-8 encoding of a code point as hexadecimal string."""
+    code, nbytes = utf8(codepoint)
+    return "%0*X" % (2*int(nbytes), int(code))
+
+
+def is_surrogate(cp):
+    return (cp >= 0xD800) & (cp <= 0xDFFF)
+
+
+def cells(cp):
+    """Return the contents of the three table rows for the code points.
+
+    The result consists of three lists of strings in the order of the
+    flattened array ``cp``: code point, UTF-8 encoding, and character.
+    """
+    flat = np.ravel(cp)
+    code, nbytes = utf8(flat)
+    labels = ["{\\footnotesize\\sffamily U+%04X}" % c for c in flat.tolist()]
+    hexcodes = ["{\\footnotesize\\sffamily %0*X}" % (2*n, c)
+                for c, n in zip(code.tolist(), nbytes.tolist())]
+    surrogate = is_surrogate(flat).tolist()
+    symbols = ["\\colorbox{cc}{%s}" % CONTROLCODES[c] if c in CONTROLCODES
+               else "\\colorbox{cc}{SUR}" if s
+               else "\\symbol{%i}" % c
+               for c, s in zip(flat.tolist(), surrogate)]
+    return labels, hexcodes, symbols
+
+
+def tables(blocks):
+    """Yield the LaTeX code of the tables for the given blocks."""
+    blocks = list(blocks)
+    labels, hexcodes, symbols = cells(codepoints(blocks))
+    for b in range(len(blocks)):
+        parts = [_HEAD]
+        for lsb in range(16):
+            start = (b*16+lsb)*8
+            row = slice(start, start+8)
+            parts.append("\\rowcolor{grau1}\n")
+            parts.append("  &\n".join(labels[row]))
+            parts.append(" \\\\\n\\rowcolor{grau2}\n")
+            parts.append("  &\n".join(hexcodes[row]))
+            parts.append(" \\\\\n\\vrule width 0pt height 5mm depth 2mm\n")
+            parts.append("  &\n".join(symbols[row]))
+            parts.append(" \\\\\\hline\n")
+        parts.append(_TAIL)
+        yield "".join(parts)
+
+
+def document(blocks):
+    """Return a complete XeLaTeX document with tables for the blocks."""
+    return "".join([PREAMBLE, *tables(blocks), END])
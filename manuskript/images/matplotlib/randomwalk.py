@@ -1,23 +1,11 @@
-from math import pi
-
-import numpy as np
-from numpy.random import rand
 import matplotlib.pyplot as plt
 
+from eidprog import decimate, randomwalk
 
-npts = 10000
-r = 0.1
-for i in range(3):
-    richtung = 2*pi*rand(npts)
-    dx = r*np.cos(richtung)
-    dy = r*np.sin(richtung)
-
-    x = [0]
-    y = [0]
-    for n in range(npts):
-        x.append(x[-1]+dx[n])
-        y.append(y[-1]+dy[n])
-    plt.plot(x, y)
+x, y = randomwalk.trajectories(nwalkers=3, nsteps=10000, r=0.1, seed=1)
+ax = plt.gca()
+for xwalk, ywalk in zip(x, y):
+    decimate.plot(ax, xwalk, ywalk)
 
 plt.xlabel("x")
 plt.ylabel("y")
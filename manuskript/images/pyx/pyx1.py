@@ -1,6 +1,7 @@
 from pyx import graph
 
+from eidprog import datafile
+
 g = graph.graphxy(width=8)
-g.plot(graph.data.file("pyx1.dat", x=1, y=2))
+g.plot(datafile.data("pyx1.dat", x=1, y=2))
 g.writePDFfile()
-g.writeGSfile(device="pnggray", resolution=800)
@@ -14,4 +14,3 @@ c.fill(path.circle(x2, y2, 0.1), [color.rgb.blue])
 c.stroke(p1, [color.rgb.red])
 c.stroke(p2, [color.rgb.green])
 c.writePDFfile()
-c.writeGSfile(device="png16m", resolution=800)